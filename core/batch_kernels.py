@@ -0,0 +1,193 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba 为可选依赖，未安装时使用纯 NumPy 实现
+    njit = None
+    prange = range
+
+# 预先声明的编译签名（批量数据统一为 float64 存储精度），模块导入时即完成编译或读取缓存，避免首次调用时的 JIT 延迟
+_MODIFY_SIGNATURES = [
+    'int64(float64[:], float64, float64, float64, float64[:])',
+]
+_ANY_NEQ_SIGNATURES = [
+    'boolean(float64[:], float64, float64, float64)',
+]
+_FILTER_SIGNATURES = [
+    'UniTuple(float64[:], 3)(float64[:], float64[:], float64[:], float64, float64, boolean)',
+]
+
+if njit is not None:
+    @njit(_MODIFY_SIGNATURES, parallel=True, cache=True)
+    def modify_in_range(thickness, lo, hi, param, out):
+        """
+        将 [lo, hi] 范围内的厚度改为 param，结果写入 out
+
+        返回: 实际发生变化（原值不等于 param）的点数
+        """
+        changed = 0
+        for i in prange(thickness.size):
+            t = thickness[i]
+            if lo <= t <= hi:
+                out[i] = param
+                if t != param:
+                    changed += 1
+            else:
+                out[i] = t
+        return changed
+
+    @njit(_ANY_NEQ_SIGNATURES, cache=True)
+    def any_in_range_neq(thickness, lo, hi, param):
+        """[lo, hi] 范围内是否存在不等于 param 的厚度（找到第一个即返回）"""
+        for i in range(thickness.size):
+            t = thickness[i]
+            if lo <= t <= hi and t != param:
+                return True
+        return False
+
+    @njit(_FILTER_SIGNATURES, cache=True)
+    def filter_in_range(x, y, thickness, lo, hi, keep_in_range):
+        """
+        单次遍历按厚度范围筛选数据点
+
+        keep_in_range 为 True 时保留 [lo, hi] 范围内的点，否则保留范围外的点
+        返回: 筛选后的 (x, y, thickness)
+        """
+        n = thickness.size
+        x_out = np.empty(n, dtype=x.dtype)
+        y_out = np.empty(n, dtype=y.dtype)
+        t_out = np.empty(n, dtype=thickness.dtype)
+        k = 0
+        for i in range(n):
+            t = thickness[i]
+            if (lo <= t <= hi) == keep_in_range:
+                x_out[k] = x[i]
+                y_out[k] = y[i]
+                t_out[k] = t
+                k += 1
+        return x_out[:k], y_out[:k], t_out[:k]
+else:
+    def modify_in_range(thickness, lo, hi, param, out):
+        """
+        将 [lo, hi] 范围内的厚度改为 param，结果写入 out
+
+        返回: 实际发生变化（原值不等于 param）的点数
+        """
+        # 两次比较共用缓冲区
+        mask = np.greater_equal(thickness, lo)
+        scratch = np.less_equal(thickness, hi)
+        mask &= scratch
+        changed = np.not_equal(thickness, param, out=scratch)
+        changed &= mask
+        out[...] = thickness
+        out[mask] = param
+        return int(np.count_nonzero(changed))
+
+    def any_in_range_neq(thickness, lo, hi, param):
+        """[lo, hi] 范围内是否存在不等于 param 的厚度"""
+        changed = np.greater_equal(thickness, lo)
+        changed &= np.less_equal(thickness, hi)
+        changed &= np.not_equal(thickness, param)
+        return bool(changed.any())
+
+    def filter_in_range(x, y, thickness, lo, hi, keep_in_range):
+        """
+        按厚度范围筛选数据点
+
+        keep_in_range 为 True 时保留 [lo, hi] 范围内的点，否则保留范围外的点
+        返回: 筛选后的 (x, y, thickness)
+        """
+        keep = np.greater_equal(thickness, lo)
+        keep &= np.less_equal(thickness, hi)
+        if not keep_in_range:
+            np.logical_not(keep, out=keep)
+        idx = np.flatnonzero(keep)
+        return x.take(idx), y.take(idx), thickness.take(idx)
+
+
+def iqr_quartiles(values):
+    """
+    基于 np.partition 计算第一、第三四分位数（线性插值，与 np.percentile 结果一致）
+
+    空数组返回 (NaN, NaN)
+    """
+    n = values.size
+    if n == 0:
+        return np.nan, np.nan
+    pos25 = 0.25 * (n - 1)
+    pos75 = 0.75 * (n - 1)
+    lo25 = int(pos25)
+    lo75 = int(pos75)
+    hi25 = min(lo25 + 1, n - 1)
+    hi75 = min(lo75 + 1, n - 1)
+    parted = np.partition(values, np.array([lo25, hi25, lo75, hi75]))
+    q1 = parted[lo25] + (parted[hi25] - parted[lo25]) * (pos25 - lo25)
+    q3 = parted[lo75] + (parted[hi75] - parted[lo75]) * (pos75 - lo75)
+    return q1, q3
+
+def detect_iqr_outliers_batch(z_concat, offsets):
+    """
+    批量检测多片晶圆的 IQR 异常值
+
+    z_concat: 各晶圆厚度数据首尾拼接的一维数组
+    offsets: 长度为 晶圆数+1 的起止位置数组，第 i 片为 z_concat[offsets[i]:offsets[i+1]]
+    返回: (bounds, outlier_mask)，bounds[i] 为第 i 片的 (下界, 上界)
+    """
+    n_files = offsets.size - 1
+    bounds = np.empty((n_files, 2))
+    outlier_mask = np.zeros(z_concat.size, dtype=np.bool_)
+
+    for i in prange(n_files):
+        start = offsets[i]
+        z = z_concat[start:offsets[i + 1]]
+        q1, q3 = iqr_quartiles(z)
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        bounds[i, 0] = lower_bound
+        bounds[i, 1] = upper_bound
+        outlier_mask[start:offsets[i + 1]] = (z < lower_bound) | (z > upper_bound)
+
+    return bounds, outlier_mask
+
+if njit is not None:
+    iqr_quartiles = njit(cache=True)(iqr_quartiles)
+    detect_iqr_outliers_batch = njit(parallel=True, cache=True)(detect_iqr_outliers_batch)
+
+
+def _modify_columns(x, y, thickness, lo, hi, param):
+    """修改操作：返回修改后的 (x, y, thickness)，没有值改变时返回 None"""
+    # 先做可提前退出的检查，无变化的文件不分配输出也不写入
+    if not any_in_range_neq(thickness, lo, hi, param):
+        return None
+    out = np.empty_like(thickness)
+    modify_in_range(thickness, lo, hi, param, out)
+    return x, y, out
+
+def _delete_in_range_columns(x, y, thickness, lo, hi, param=None):
+    """删除范围内的点：返回保留的 (x, y, thickness)，没有点被删除时返回 None"""
+    columns = filter_in_range(x, y, thickness, lo, hi, False)
+    return columns if columns[2].size != thickness.size else None
+
+def _delete_out_of_range_columns(x, y, thickness, lo, hi, param=None):
+    """删除范围外的点：返回保留的 (x, y, thickness)，没有点被删除时返回 None"""
+    columns = filter_in_range(x, y, thickness, lo, hi, True)
+    return columns if columns[2].size != thickness.size else None
+
+# 批量点编辑操作表: (operation, operation_type) -> 处理函数
+BATCH_OPERATIONS = {
+    ('modify', None): _modify_columns,
+    ('delete', 'in_range'): _delete_in_range_columns,
+    ('delete', 'out_of_range'): _delete_out_of_range_columns,
+}
+
+def select_batch_operation(operation, operation_type, operation_param):
+    """
+    按操作类型选择处理函数（整批只选择一次）
+
+    处理函数签名为 (x, y, thickness, lo, hi, param)，结果无变化时返回 None；
+    无效操作返回 None
+    """
+    if operation == 'modify':
+        return _modify_columns if operation_param is not None else None
+    return BATCH_OPERATIONS.get((operation, operation_type))
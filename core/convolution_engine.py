@@ -8,10 +8,31 @@ import csv
 import os
 import pandas as pd
 import io
+from functools import lru_cache
 
 # 确保使用非交互式后端，适合在工作线程中使用
 matplotlib.use('Agg')  # 使用Agg后端生成图像而不显示
 
+@lru_cache(maxsize=8)
+def _circle_mask(x_bytes, y_bytes, center_x, center_y, diameter):
+    """
+    按网格坐标和圆形参数缓存圆形遮罩（只读布尔数组，形状为 (len(y), len(x))）
+    坐标以 bytes 形式传入以便作为缓存键
+    """
+    x_coords = np.frombuffer(x_bytes, dtype=np.float64)
+    y_coords = np.frombuffer(y_bytes, dtype=np.float64)
+    radius = diameter / 2.0
+    
+    # 广播计算各点到圆心的距离，不生成完整的坐标网格
+    distance = np.sqrt((x_coords[np.newaxis, :] - center_x)**2 + (y_coords[:, np.newaxis] - center_y)**2)
+    mask = distance <= radius
+    mask.setflags(write=False)
+    return mask
+
+class ConvolutionCancelled(Exception):
+    """计算被取消（由新的计算请求中断）"""
+    pass
+
 class ConvolutionEngine:
     def __init__(self):
         # 初始化引擎变量
@@ -33,6 +54,38 @@ class ConvolutionEngine:
         
         # 记录最后一次计算使用的镜像状态
         self.last_mirror_state = False
+        
+        # 文件解析缓存: 加载函数名 -> (路径, 修改时间, 解析结果)
+        self._load_cache = {}
+    
+    def _load_cached(self, loader, file_path):
+        """按 (路径, 修改时间) 缓存成功的文件解析结果，文件未变化时直接复用"""
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return loader(file_path)
+        
+        key = loader.__name__
+        cached = self._load_cache.get(key)
+        if cached is not None and cached[0] == file_path and cached[1] == mtime:
+            return cached[2]
+        
+        result = loader(file_path)
+        arrays = result if isinstance(result, tuple) else (result,)
+        # 加载失败时（加载函数返回空数组）不缓存，文件修复后可重新读取
+        if arrays[0].size == 0:
+            return result
+        # 缓存的数组设为只读，防止被后续处理意外修改
+        for arr in arrays:
+            arr.setflags(write=False)
+        self._load_cache[key] = (file_path, mtime, result)
+        return result
+    
+    @staticmethod
+    def _check_cancel(cancel_event):
+        """检查取消标志，已请求取消时中断计算"""
+        if cancel_event is not None and cancel_event.is_set():
+            raise ConvolutionCancelled()
     
     def set_circle_params(self, diameter, center_x, center_y):
         """设置圆形区域参数"""
@@ -53,19 +106,20 @@ class ConvolutionEngine:
         
         return mask
     
+    def get_circle_mask(self, x_coords, y_coords):
+        """获取当前圆形参数下的圆形遮罩（相同网格和参数时复用缓存）"""
+        return _circle_mask(
+            np.ascontiguousarray(x_coords, dtype=np.float64).tobytes(),
+            np.ascontiguousarray(y_coords, dtype=np.float64).tobytes(),
+            float(self.center_x), float(self.center_y), float(self.circle_diameter)
+        )
+    
     def apply_circle_mask(self, matrix, x_coords, y_coords):
         """应用圆形遮罩到矩阵"""
-        # 创建网格坐标
-        X, Y = np.meshgrid(x_coords, y_coords)
+        mask = self.get_circle_mask(x_coords, y_coords)
         
-        # 创建圆形遮罩
-        mask = self.create_circle_mask(X, Y, self.center_x, self.center_y, self.circle_diameter)
-        
-        # 复制矩阵，将遮罩外部设为NaN
-        masked_matrix = matrix.copy()
-        masked_matrix[~mask] = np.nan
-        
-        return masked_matrix
+        # 一次生成遮罩外部为NaN的新矩阵
+        return np.where(mask, matrix, np.nan)
     
     def load_dwell_time_matrix(self, file_path):
         """
@@ -410,16 +464,19 @@ class ConvolutionEngine:
         
         return image_path, csv_path
     
-    def process_etch_depth(self, dwell_time_csv, ion_beam_csv):
+    def process_etch_depth(self, dwell_time_csv, ion_beam_csv, cancel_event=None):
         """
         主处理函数：计算刻蚀深度分布
+        cancel_event: 可选的 threading.Event，置位后在下一个处理阶段前抛出 ConvolutionCancelled
         返回: (heatmap_path, csv_path)
         """
         mirror_center = None
         
         try:
-            # 加载停留时间分布
-            dwell_matrix, x_coords, y_coords = self.load_dwell_time_matrix(dwell_time_csv)
+            # 加载停留时间分布（文件未修改时复用上次的解析结果）
+            dwell_matrix, x_coords, y_coords = self._load_cached(
+                self.load_dwell_time_matrix, dwell_time_csv
+            )
             self.x_coords = x_coords
             self.y_coords = y_coords
             orig_y_coords = y_coords.copy()  # 保存原始y坐标用于镜像中心计算
@@ -451,9 +508,10 @@ class ConvolutionEngine:
             
             # 替换NaN为0
             dwell_matrix = np.nan_to_num(dwell_matrix, nan=0.0)
+            self._check_cancel(cancel_event)
             
             # 加载离子束profile
-            ion_beam_profile = self.load_ion_beam_profile(ion_beam_csv)
+            ion_beam_profile = self._load_cached(self.load_ion_beam_profile, ion_beam_csv)
             
             # 确保矩阵尺寸兼容
             if ion_beam_profile.size == 0:
@@ -461,6 +519,7 @@ class ConvolutionEngine:
             
             # 执行卷积计算
             etch_depth = self.convolve_matrix(dwell_matrix, ion_beam_profile)
+            self._check_cancel(cancel_event)
             
             # 保存结果
             base_name = os.path.splitext(os.path.basename(dwell_time_csv))[0]
@@ -468,6 +527,8 @@ class ConvolutionEngine:
             
             # 生成图像和CSV（传递镜像中心）
             return self.generate_heatmap(etch_depth, x_coords, y_coords, output_dir, base_name, mirror_center)
+        except ConvolutionCancelled:
+            raise
         except Exception as e:
             # 即使出错也生成图像和CSV占位符
             base_name = os.path.splitext(os.path.basename(dwell_time_csv))[0]
@@ -1,10 +1,17 @@
+import hashlib
 import numpy as np
 import os
+import shutil
 import pandas as pd
 from io import StringIO
 from scipy.interpolate import griddata, RBFInterpolator
 from scipy.spatial import cKDTree
 
+# 解析结果缓存目录（位于应用配置目录下），None 表示首次使用时确定
+PARSED_CACHE_DIR = None
+# 旧版本保存在原数据文件旁的解析缓存文件后缀（清除缓存时一并删除）
+_LEGACY_CACHE_SUFFIX = '.parsed.npy'
+
 def load_wafer_data(file_path):
     raw_lines = []
     encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16']
@@ -38,7 +45,7 @@ def load_wafer_data(file_path):
     df = pd.read_csv(
         StringIO('\n'.join(cleaned_data)),
         sep=main_sep,
-        engine='python',
+        engine='c',
         header=0 if len(cleaned_data) > 1 else None
     )
 
@@ -51,6 +58,98 @@ def load_wafer_data(file_path):
 
     return df.values, os.path.basename(file_path)
 
+def _parsed_cache_dir():
+    """返回解析缓存目录"""
+    global PARSED_CACHE_DIR
+    if PARSED_CACHE_DIR is None:
+        from PyQt5.QtCore import QStandardPaths
+        PARSED_CACHE_DIR = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation), 'parsed_cache'
+        )
+    return PARSED_CACHE_DIR
+
+def _parsed_cache_subdir(file_path):
+    """源文件对应的缓存子目录（按源文件绝对路径的哈希命名）"""
+    key = os.path.normcase(os.path.abspath(file_path)).encode('utf-8')
+    return os.path.join(_parsed_cache_dir(), hashlib.sha1(key).hexdigest())
+
+def _parsed_cache_path(file_path):
+    """
+    源文件当前版本对应的缓存文件路径
+
+    文件名由源文件的 mtime_ns 与大小组成，两者都与缓存一致时才视为命中
+    """
+    st = os.stat(file_path)
+    return os.path.join(_parsed_cache_subdir(file_path), f"{st.st_mtime_ns}-{st.st_size}.npy")
+
+def _store_parsed_cache(cache_path, data):
+    """写入解析缓存，并删除同一源文件的旧版本缓存"""
+    cache_dir, name = os.path.split(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_path, data)
+    except OSError:
+        return  # 缓存目录不可写时仅放弃缓存
+    for entry in os.scandir(cache_dir):
+        if entry.name != name:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue  # 仍被映射的旧缓存（Windows）留待下次清理
+
+def save_wafer_data_cache(file_path, data):
+    """为刚写出的数据文件保存解析缓存，重新加载时无需再次解析该文件"""
+    try:
+        cache_path = _parsed_cache_path(file_path)
+    except OSError:
+        return
+    _store_parsed_cache(cache_path, data)
+
+def load_wafer_data_cached(file_path, dtype=None, mmap_mode=None):
+    """
+    带磁盘缓存的 load_wafer_data：源文件的 mtime_ns 与大小均与缓存一致时直接读取，跳过文本解析
+
+    dtype: 缓存及返回数据的精度，None 表示保持解析结果的精度
+    mmap_mode: 传给 np.load 的内存映射模式（如 'r'），映射的数组按需读取、不复制
+    """
+    try:
+        cache_path = _parsed_cache_path(file_path)
+    except OSError:
+        cache_path = None  # 源文件无法访问，交给 load_wafer_data 报错
+    if cache_path is not None:
+        try:
+            data = np.load(cache_path, mmap_mode=mmap_mode)
+            if dtype is None or data.dtype == dtype:
+                return data, os.path.basename(file_path)
+        except (OSError, ValueError):
+            pass
+
+    data, filename = load_wafer_data(file_path)
+    if dtype is not None:
+        data = data.astype(dtype, copy=False)
+    if cache_path is not None:
+        _store_parsed_cache(cache_path, data)
+    return data, filename
+
+def clear_wafer_data_cache(folder):
+    """删除文件夹（包括子文件夹）中数据文件的解析缓存，返回删除的缓存数"""
+    removed = 0
+    for root, _, files in os.walk(folder):
+        for file in files:
+            path = os.path.join(root, file)
+            if file.endswith(_LEGACY_CACHE_SUFFIX):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+                continue
+            cache_dir = _parsed_cache_subdir(path)
+            if os.path.isdir(cache_dir):
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                removed += 1
+    return removed
+
 def process_data(data, wafer_size, extend_edge):
     x, y, z = data.T
     wafer_radius = wafer_size / 2
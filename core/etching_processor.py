@@ -9,6 +9,7 @@ import os
 import time
 from scipy.interpolate import RBFInterpolator, griddata
 from core.convolution_engine import ConvolutionEngine  # 导入卷积引擎
+from core.map_kernels import masked_min_max_mean
 
 class IonBeamProcessor:
     def __init__(self, grid_size=170.0, resolution=1.0, wafer_diameter=150.0, extend_edge=True, transition_width=50.0):
@@ -93,13 +94,9 @@ class IonBeamProcessor:
                 'uniformity': 0
             }
 
-        # 使用晶圆掩模获取晶圆内部的数据
-        wafer_data = thickness_map[self.wafer_mask]
-        
-        # 计算基本统计信息
-        min_val = np.min(wafer_data)
-        max_val = np.max(wafer_data)
-        mean_val = np.mean(wafer_data)
+        # 单次遍历晶圆内部的数据计算基本统计信息（不生成掩模索引副本）
+        min_val, max_val, mean_val = masked_min_max_mean(
+            np.ascontiguousarray(thickness_map).ravel(), self.wafer_mask.ravel())
         
         # 计算膜厚均一性: U% = 100 * Range / (2 * average)
         range_val = max_val - min_val
@@ -126,13 +123,8 @@ class IonBeamProcessor:
         # 计算刻蚀量 = 初始膜厚 - 刻蚀后膜厚
         etch_amount_map = self.initial_thickness_map - result_thickness_map
 
-        # 使用晶圆掩模获取晶圆内部的数据
-        wafer_etch_data = etch_amount_map[self.wafer_mask]
-
-        # 计算基本统计信息
-        min_val = np.min(wafer_etch_data)
-        max_val = np.max(wafer_etch_data)
-        mean_val = np.mean(wafer_etch_data)
+        # 单次遍历晶圆内部的数据计算基本统计信息
+        min_val, max_val, mean_val = masked_min_max_mean(etch_amount_map.ravel(), self.wafer_mask.ravel())
 
         # 计算刻蚀量均一性: U% = 100 * Range / (2 * average)
         range_val = max_val - min_val
@@ -0,0 +1,106 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba 为可选依赖，未安装时使用纯 NumPy 实现
+    njit = None
+    prange = range
+
+# 预先声明的编译签名，模块导入时即完成编译或读取缓存，避免首次模拟时的 JIT 延迟
+_MASKED_STATS_SIGNATURES = [
+    'UniTuple(float64, 3)(float64[:], boolean[:])',
+    'UniTuple(float64, 3)(float32[:], boolean[:])',
+]
+
+if njit is not None:
+    @njit(_MASKED_STATS_SIGNATURES, cache=True)
+    def masked_min_max_mean(values, mask):
+        """
+        单次遍历计算 mask 为 True 处数值的 (最小值, 最大值, 平均值)
+
+        values 与 mask 为同形状的一维数组；含 NaN 或没有选中点时返回全 NaN
+        """
+        mn = np.inf
+        mx = -np.inf
+        total = 0.0
+        n = 0
+        for i in range(values.size):
+            if mask[i]:
+                v = values[i]
+                if v != v:
+                    return np.nan, np.nan, np.nan
+                if v < mn:
+                    mn = v
+                if v > mx:
+                    mx = v
+                total += v
+                n += 1
+        if n == 0:
+            return np.nan, np.nan, np.nan
+        return mn, mx, total / n
+else:
+    def masked_min_max_mean(values, mask):
+        """
+        计算 mask 为 True 处数值的 (最小值, 最大值, 平均值)
+
+        values 与 mask 为同形状的一维数组；含 NaN 或没有选中点时返回全 NaN
+        """
+        selected = values[mask]
+        if selected.size == 0:
+            return np.nan, np.nan, np.nan
+        return selected.min(), selected.max(), selected.mean()
+
+# out 可为 float32 以得到降精度的显示用副本（转换在同一遍中完成）
+_MASK_FILL_SIGNATURES = [
+    'void(float64[:, :], boolean[:, :], float64[:, :])',
+    'void(float64[:, :], boolean[:, :], float32[:, :])',
+    'void(float32[:, :], boolean[:, :], float32[:, :])',
+]
+
+if njit is not None:
+    @njit(_MASK_FILL_SIGNATURES, parallel=True, cache=True)
+    def fill_nan_outside_mask(data, mask, out):
+        """
+        单次遍历将 mask 为 True 处的 data 写入 out，其余位置写 NaN
+
+        data、mask、out 为同形状的二维数组
+        """
+        for i in prange(data.shape[0]):
+            for j in range(data.shape[1]):
+                out[i, j] = data[i, j] if mask[i, j] else np.nan
+else:
+    def fill_nan_outside_mask(data, mask, out):
+        """
+        将 mask 为 True 处的 data 写入 out，其余位置写 NaN
+
+        data、mask、out 为同形状的二维数组
+        """
+        out.fill(np.nan)
+        np.copyto(out, data, where=mask)
+
+_MASKED_DIFF_SIGNATURES = [
+    'void(float64[:, :], float64[:, :], boolean[:, :], float64[:, :])',
+    'void(float64[:, :], float64[:, :], boolean[:, :], float32[:, :])',
+    'void(float32[:, :], float32[:, :], boolean[:, :], float32[:, :])',
+]
+
+if njit is not None:
+    @njit(_MASKED_DIFF_SIGNATURES, parallel=True, cache=True)
+    def masked_difference(a, b, mask, out):
+        """
+        单次遍历将 mask 为 True 处的 a - b 写入 out，其余位置写 NaN
+
+        a、b、mask、out 为同形状的二维数组
+        """
+        for i in prange(a.shape[0]):
+            for j in range(a.shape[1]):
+                out[i, j] = a[i, j] - b[i, j] if mask[i, j] else np.nan
+else:
+    def masked_difference(a, b, mask, out):
+        """
+        将 mask 为 True 处的 a - b 写入 out，其余位置写 NaN
+
+        a、b、mask、out 为同形状的二维数组
+        """
+        np.subtract(a, b, out=out)
+        out[~mask] = np.nan
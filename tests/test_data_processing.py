@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+
+from core import data_processing
+
+
+def _write_csv(path, rows):
+    with open(path, 'w') as f:
+        f.write('x,y,thickness\n')
+        for row in rows:
+            f.write(','.join(str(v) for v in row) + '\n')
+
+
+def test_cache_invalidated_by_older_file_of_different_size(tmp_path, monkeypatch):
+    """CSV 被修改时间更早、大小不同的文件替换后，不能返回旧的解析缓存"""
+    monkeypatch.setattr(data_processing, 'PARSED_CACHE_DIR', str(tmp_path / 'cache'))
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    csv_path = str(data_dir / 'wafer.csv')
+
+    _write_csv(csv_path, [(0.0, 0.0, 100.0), (1.0, 0.0, 101.0), (0.0, 1.0, 102.0)])
+    first, _ = data_processing.load_wafer_data_cached(csv_path)
+    np.testing.assert_array_equal(first[:, 2], [100.0, 101.0, 102.0])
+
+    # 以更早的修改时间替换为不同大小的文件（如复制时保留时间戳、解压或 git checkout）
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    _write_csv(csv_path, [(0.0, 0.0, 200.5), (1.0, 0.0, 201.5), (0.0, 1.0, 202.5), (1.0, 1.0, 203.5)])
+    older = mtime_ns - 10 * 10**9
+    os.utime(csv_path, ns=(older, older))
+
+    second, _ = data_processing.load_wafer_data_cached(csv_path)
+    np.testing.assert_array_equal(second[:, 2], [200.5, 201.5, 202.5, 203.5])
+
+
+def test_cache_not_written_next_to_data(tmp_path, monkeypatch):
+    """解析缓存保存在缓存目录中，数据文件夹中只有原始文件"""
+    monkeypatch.setattr(data_processing, 'PARSED_CACHE_DIR', str(tmp_path / 'cache'))
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    csv_path = str(data_dir / 'wafer.csv')
+    _write_csv(csv_path, [(0.0, 0.0, 100.0), (1.0, 0.0, 101.0), (0.0, 1.0, 102.0)])
+
+    data_processing.load_wafer_data_cached(csv_path)
+    cached, _ = data_processing.load_wafer_data_cached(csv_path, mmap_mode='r')
+
+    assert os.listdir(data_dir) == ['wafer.csv']
+    np.testing.assert_array_equal(cached[:, 2], [100.0, 101.0, 102.0])
+    assert data_processing.clear_wafer_data_cache(str(data_dir)) == 1
@@ -530,7 +530,7 @@ class BatchPointEditDialog(QDialog):
                 
                 # 创建基于范围的掩码
                 mask = (thickness_values >= min_bound) & (thickness_values <= max_bound)
-                stats['target_count'] = np.sum(mask)  # 范围内点数量
+                stats['target_count'] = np.count_nonzero(mask)  # 范围内点数量
             
             else:  # absolute method
                 # ==== 绝对范围处理 ====
@@ -548,7 +548,7 @@ class BatchPointEditDialog(QDialog):
                 
                 # 计算绝对范围内的点
                 mask = (thickness_values >= min_val) & (thickness_values <= max_val)
-                stats['target_count'] = np.sum(mask)  # 范围内点数量
+                stats['target_count'] = np.count_nonzero(mask)  # 范围内点数量
                 stats['start_value'] = min_val  # 记录下界值
             
             # 计算保留和删除的数量 (根据操作类型的预览计算)
@@ -651,7 +651,7 @@ class BatchPointEditDialog(QDialog):
         
         # 获取父窗口引用
         parent = self.parent()
-        if not hasattr(parent, 'process_batch_files'):
+        if not hasattr(parent, 'create_batch_thread'):
             QMessageBox.critical(self, "错误", "无法访问批量处理功能")
             return
             
@@ -679,7 +679,8 @@ class BatchPointEditDialog(QDialog):
             min_val, max_val = range_values
             range_value = (min_val, max_val)
             
-        modified_files = parent.process_batch_files(
+        # 在后台线程中处理文件（新线程避免UI冻结）
+        batch_thread = parent.create_batch_thread(
             self.stats_data, 
             operation, 
             operation_type, 
@@ -688,6 +689,21 @@ class BatchPointEditDialog(QDialog):
             operation_param,
             range_value
         )
+        if batch_thread is None:
+            QMessageBox.information(self, "提示", "批量处理正在进行中，请稍候")
+            return
+        
+        self.apply_btn.setEnabled(False)
+        self.apply_btn.setText("处理中...")
+        batch_thread.results_ready.connect(self.on_process_complete)
+        batch_thread.error_occurred.connect(self.on_process_error)
+        batch_thread.start()
+    
+    def on_process_complete(self, modified_files):
+        """批量处理完成"""
+        self.apply_btn.setEnabled(True)
+        self.apply_btn.setText("应用")
+        parent = self.parent()
             
         if modified_files:
             # 存储修改后的文件列表
@@ -702,6 +718,12 @@ class BatchPointEditDialog(QDialog):
         else:
             QMessageBox.information(self, "结果", "没有文件被修改")
     
+    def on_process_error(self, error_msg):
+        """批量处理出错"""
+        self.apply_btn.setEnabled(True)
+        self.apply_btn.setText("应用")
+        QMessageBox.critical(self, "错误", f"批量处理失败: {error_msg}")
+    
     def show_details(self):
         """显示详细信息对话框"""
         if not self.stats_data:
@@ -1,85 +1,279 @@
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
     QScrollArea, QGridLayout, QCheckBox, QSizePolicy, QMessageBox,
     QLineEdit, QFileDialog, QMenu, QInputDialog
 )
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QPixmapCache
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import (
-    FigureCanvasQTAgg as FigureCanvas,
-    NavigationToolbar2QT as NavigationToolbar
-)
-import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Circle
 from scipy.interpolate import griddata
 import matplotlib as mpl
-from core.data_processing import load_wafer_data
+from core.data_processing import load_wafer_data_cached, clear_wafer_data_cache, save_wafer_data_cache
 from core.batch_processing import get_all_csv_files, get_file_priority_info
 from ui.batch_point_edit_dialog import BatchPointEditDialog, BatchStatisticsDetailsDialog
 import re
 
-class WaferMiniature(FigureCanvas):
-    """单个晶圆小图控件"""
-    def __init__(self, data, filename, wafer_size=150, width=5, height=5, parent=None):
+# 异常值处理文件名后缀：group(1) 为 '.csv' 表示首次处理，'_round' 表示多轮处理
+_ERROR_DELETED_RX = re.compile(r'_error_deleted(\.csv$|_round)?')
+
+# 批量数据CSV写出格式（整行格式预先拼好，写出时一次格式化全部数据）；
+# %s 对浮点数输出可精确还原的最短十进制表示（与 repr 相同），未修改的值写回后保持不变
+_CSV_FMT = '%s'
+_CSV_HEADER = 'x,y,thickness'
+_CSV_ROW_FMT = ','.join([_CSV_FMT] * 3) + '\n'
+
+# 批量处理的后台写盘线程数，以及等待写盘的文件数上限（限制已编码文本占用的内存）
+_WRITER_THREADS = 4
+_MAX_PENDING_WRITES = 8
+
+# 缩略图位图缓存上限（KB），约可缓存数页缩略图
+_MINIATURE_CACHE_LIMIT_KB = 64 * 1024
+
+# 缩略图尺寸变化后按新尺寸重新渲染的延迟（ms），拖动调整大小期间只缩放已有位图
+_MINIATURE_RERENDER_DELAY_MS = 150
+
+# 缩略图插值网格缓存 {wafer_size: (grid_x, grid_y, outside_mask)}
+_GRID_CACHE = {}
+
+def _get_grid(wafer_size):
+    """获取指定晶圆尺寸的缩略图插值网格及晶圆外区域掩码（按尺寸缓存）"""
+    grid = _GRID_CACHE.get(wafer_size)
+    if grid is None:
+        wafer_radius = wafer_size / 2
+        scale = wafer_radius * 1.05
+        grid_x, grid_y = np.meshgrid(
+            np.linspace(-scale, scale, 100),
+            np.linspace(-scale, scale, 100)
+        )
+        outside_mask = np.sqrt(grid_x**2 + grid_y**2) > wafer_radius
+        for arr in (grid_x, grid_y, outside_mask):
+            arr.setflags(write=False)
+        grid = (grid_x, grid_y, outside_mask)
+        _GRID_CACHE[wafer_size] = grid
+    return grid
+
+class WaferMiniature(QLabel):
+    """单个晶圆小图控件（离屏渲染为位图显示，已渲染的缩略图缓存在 QPixmapCache 中）"""
+    double_clicked = pyqtSignal()
+    
+    # 缩略图缓存版本：重新加载文件夹时递增 _generation，单个文件数据更新时递增该文件的版本；
+    # 旧版本的位图不再命中，由 QPixmapCache 按容量淘汰，不影响其他缓存的位图
+    _generation = 0
+    _file_versions = {}
+    
+    @classmethod
+    def invalidate_cache(cls, file_path=None):
+        """使已缓存的缩略图失效：指定文件路径时只影响该文件，否则影响全部缩略图"""
+        if file_path is None:
+            cls._generation += 1
+        else:
+            cls._file_versions[file_path] = cls._file_versions.get(file_path, 0) + 1
+    
+    def __init__(self, data, filename, wafer_size=150, width=5, height=5, parent=None,
+                 file_path=None, unified_range=None):
+        super().__init__(parent)
         self.fig = Figure(figsize=(width, height), dpi=60)
-        super().__init__(self.fig)
-        self.setParent(parent)
+        self.agg_canvas = FigureCanvasAgg(self.fig)
         self.setMinimumSize(80, 80)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAlignment(Qt.AlignCenter)
+        self._size_hint = QSize(*self.agg_canvas.get_width_height())
+        self._pixmap = None
+        self._contour = None  # 当前图形中的等高线对象
+        self._drawn_data = None  # 当前图形对应的数据
+        self._drawn_wafer_size = None
+        self._data_range = None  # 当前图形数据的厚度范围 (vmin, vmax)
+        self._applied_data = None  # 当前显示位图对应的数据
+        self._applied_wafer_size = None
+        self._applied_norm = None  # 当前显示位图的统一颜色范围 (vmin, vmax)，None 表示未统一
+        self._drawn_norm = None  # 当前图形的统一颜色范围
+        self._rendered_side = None  # 当前显示位图的边长（设备像素）
+        self._laid_out = False  # 是否已由布局确定大小
+        self._rerender_timer = QTimer(self)
+        self._rerender_timer.setSingleShot(True)
+        self._rerender_timer.setInterval(_MINIATURE_RERENDER_DELAY_MS)
+        self._rerender_timer.timeout.connect(self._rerender_for_size)
         self.data = data
         self.filename = os.path.basename(filename)
+        self.file_path = file_path
         self.wafer_size = wafer_size
-        self.unified_norm = None
+        self.unified_norm = mpl.colors.Normalize(*unified_range) if unified_range else None
         
         # 设置紧凑布局
         self.fig.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.95)
-        self.draw_wafer()
+        self.refresh()
+    
+    def sizeHint(self):
+        return self._size_hint
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._laid_out = True
+        self._update_scaled_pixmap()
+        # 大小稳定后按新尺寸重新渲染，避免放大显示低分辨率位图
+        if self._pixmap is not None and self._render_side() != self._rendered_side:
+            self._rerender_timer.start()
+    
+    def mouseDoubleClickEvent(self, event):
+        self.double_clicked.emit()
+        super().mouseDoubleClickEvent(event)
+    
+    def set_wafer(self, data, filename, file_path=None, wafer_size=None, unified_range=None):
+        """复用当前控件显示另一片晶圆（翻页时避免重建控件）"""
+        self.data = data
+        self.filename = os.path.basename(filename)
+        self.file_path = file_path
+        if wafer_size is not None:
+            self.wafer_size = wafer_size
+        self.unified_norm = mpl.colors.Normalize(*unified_range) if unified_range else None
+        self.refresh()
+    
+    def _render_side(self):
+        """渲染位图的边长（设备像素）：按控件大小与屏幕缩放比例，布局前按默认尺寸"""
+        size = self.size() if self._laid_out else self._size_hint
+        return max(1, round(min(size.width(), size.height()) * self.devicePixelRatioF()))
+    
+    def _cache_key(self):
+        """缩略图位图缓存键：缓存版本、文件路径、晶圆尺寸、颜色范围与渲染尺寸"""
+        if self.file_path is None:
+            return None
+        version = self._file_versions.get(self.file_path, 0)
+        return (f"wafer_miniature|{self._generation}|{self.file_path}|{version}"
+                f"|{self.wafer_size}|{self._norm_range()}|{self._render_side()}")
+    
+    def refresh(self):
+        """显示缓存的缩略图位图，缓存未命中时重新绘制"""
+        key = self._cache_key()
+        pixmap = QPixmapCache.find(key) if key else None
+        if pixmap is not None and not pixmap.isNull():
+            self._set_display_pixmap(pixmap)
+        else:
+            self.draw_wafer()
+    
+    def _rerender_for_size(self):
+        """按控件当前尺寸重新渲染显示位图"""
+        if self._render_side() == self._rendered_side:
+            return
+        key = self._cache_key()
+        pixmap = QPixmapCache.find(key) if key else None
+        if pixmap is not None and not pixmap.isNull():
+            self._set_display_pixmap(pixmap)
+        elif (self._contour is not None and self._drawn_data is self.data
+                and self._drawn_wafer_size == self.wafer_size
+                and self._drawn_norm == self._norm_range()):
+            self.render_to_pixmap()  # 图形已对应当前显示内容，只按新尺寸重新栅格化
+        else:
+            self.draw_wafer()
+    
+    def render_to_pixmap(self):
+        """按控件尺寸（含屏幕缩放比例）离屏渲染当前图形为位图，并写入缓存"""
+        # 图形尺寸（英寸）不变，只调整 dpi，文字与线条随位图等比缩放
+        self.fig.set_dpi(self._render_side() / max(self.fig.get_size_inches()))
+        self.agg_canvas.draw()
+        width, height = self.agg_canvas.get_width_height()
+        image = QImage(self.agg_canvas.buffer_rgba(), width, height, QImage.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        
+        key = self._cache_key()
+        if key:
+            QPixmapCache.insert(key, pixmap)
+        self._set_display_pixmap(pixmap)
+        return pixmap
+    
+    def _set_display_pixmap(self, pixmap):
+        self._pixmap = pixmap
+        self._applied_data = self.data
+        self._applied_wafer_size = self.wafer_size
+        self._applied_norm = self._norm_range()
+        self._rendered_side = self._render_side()
+        self._update_scaled_pixmap()
+    
+    def _update_scaled_pixmap(self):
+        """按控件大小（设备像素）等比缩放显示位图"""
+        if self._pixmap is not None:
+            ratio = self.devicePixelRatioF()
+            scaled = self._pixmap.scaled(self.size() * ratio, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            scaled.setDevicePixelRatio(ratio)
+            self.setPixmap(scaled)
     
     def set_unified_norm(self, vmin, vmax):
         """设置统一的颜色范围"""
-        self.unified_norm = mpl.colors.Normalize(vmin, vmax)
-        self.draw_wafer()
+        self.set_norm_only(mpl.colors.Normalize(vmin, vmax))
     
     def clear_unified_norm(self):
         """清除统一颜色范围"""
-        self.unified_norm = None
-        self.draw_wafer()
+        self.set_norm_only(None)
+    
+    def _norm_range(self):
+        """当前统一颜色范围 (vmin, vmax)，未统一时为 None"""
+        if self.unified_norm:
+            return (self.unified_norm.vmin, self.unified_norm.vmax)
+        return None
+    
+    def set_norm_only(self, norm):
+        """仅更新颜色范围：图形已对应当前数据时只重设等高线的 norm，不重新插值绘制"""
+        self.unified_norm = norm
+        
+        # 显示内容已是该颜色范围时无需任何处理
+        if (self._pixmap is not None and self._applied_data is self.data
+                and self._applied_wafer_size == self.wafer_size
+                and self._applied_norm == self._norm_range()):
+            return
+        
+        key = self._cache_key()
+        pixmap = QPixmapCache.find(key) if key else None
+        if pixmap is not None and not pixmap.isNull():
+            self._set_display_pixmap(pixmap)
+            return
+        
+        if (self._contour is None or self._drawn_data is not self.data
+                or self._drawn_wafer_size != self.wafer_size):
+            self.draw_wafer()
+            return
+        
+        self._contour.set_norm(norm if norm else mpl.colors.Normalize(*self._data_range))
+        self._drawn_norm = self._norm_range()
+        # 更换 norm 后颜色条会重置刻度格式，需重新设置
+        self._colorbar.formatter = mpl.ticker.FormatStrFormatter("%.1f")
+        self._colorbar.update_ticks()
+        self.render_to_pixmap()
     
     def draw_wafer(self):
         """绘制晶圆缩略图"""
         self.fig.clear()
+        self._contour = None
         ax = self.fig.add_subplot(111)
         
         if self.data is None or len(self.data) == 0:
             ax.text(0.5, 0.5, '数据不足', ha='center', va='center', fontsize=8)
-            self.draw()
+            self.render_to_pixmap()
             return
         
         try:
-            # 提取数据
-            x, y, z = self.data.T
+            # 提取数据（坐标保持为连续的 (N,2) 数组，直接交给插值）
+            xy = np.ascontiguousarray(self.data[:, :2])
+            z = self.data[:, 2]
             wafer_radius = self.wafer_size / 2
             
             # 计算统计信息
             vmin = np.min(z)
             vmax = np.max(z)
             
-            # 创建网格
-            scale = wafer_radius * 1.05
-            x_min, x_max = -scale, scale
-            y_min, y_max = -scale, scale
-            grid_x, grid_y = np.meshgrid(
-                np.linspace(x_min, x_max, 100),
-                np.linspace(y_min, y_max, 100)
-            )
+            # 获取网格（按晶圆尺寸缓存）
+            grid_x, grid_y, outside_mask = _get_grid(self.wafer_size)
             
             # 进行插值
-            grid_z = griddata((x, y), z, (grid_x, grid_y), method='linear', fill_value=np.nan)
+            grid_z = griddata(xy, z, (grid_x, grid_y), method='linear', fill_value=np.nan)
             
             # 添加晶圆轮廓
-            distance = np.sqrt(grid_x**2 + grid_y**2)
-            grid_z[distance > wafer_radius] = np.nan
+            grid_z[outside_mask] = np.nan
             
             # 绘制等高线图
             if self.unified_norm:
@@ -89,6 +283,12 @@ class WaferMiniature(FigureCanvas):
                 contour = ax.contourf(grid_x, grid_y, grid_z, levels=35,
                                      cmap='jet', vmin=vmin, vmax=vmax)
             
+            self._contour = contour
+            self._drawn_data = self.data
+            self._drawn_wafer_size = self.wafer_size
+            self._drawn_norm = self._norm_range()
+            self._data_range = (vmin, vmax)
+            
             # 添加晶圆轮廓
             wafer = Circle((0, 0), wafer_radius, edgecolor='black', fill=False, linewidth=0.8)
             ax.add_patch(wafer)
@@ -97,6 +297,7 @@ class WaferMiniature(FigureCanvas):
             cbar = self.fig.colorbar(contour, ax=ax, fraction=0.03, pad=0.01, format="%.1f")
             cbar.set_label('nm', fontsize=6)
             cbar.ax.tick_params(labelsize=6)
+            self._colorbar = cbar
             
             # 隐藏坐标轴
             ax.set_axis_off()
@@ -105,10 +306,30 @@ class WaferMiniature(FigureCanvas):
             ax.set_title(self.filename[:25] + ('...' if len(self.filename) > 25 else ''), 
                         fontsize=6, pad=2)
             
-            self.draw()
+            self.render_to_pixmap()
         except Exception as e:
             ax.text(0.5, 0.5, f'绘制错误: {str(e)}', ha='center', va='center', fontsize=7)
-            self.draw()
+            self.render_to_pixmap()
+
+class BatchProcessThread(QThread):
+    """在后台线程中执行批量数据点处理，避免界面冻结"""
+    file_done = pyqtSignal(str, str)  # 单个文件的状态消息 (消息, 类型)
+    results_ready = pyqtSignal(list)  # 修改后保存的文件路径列表
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, batch_ui, process_args):
+        super().__init__()
+        self.batch_ui = batch_ui
+        self.process_args = process_args
+
+    def run(self):
+        try:
+            modified_files = self.batch_ui.process_batch_files(
+                *self.process_args, progress=self.file_done.emit
+            )
+            self.results_ready.emit(modified_files)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
 
 class BatchWaferUI(QWidget):
     """批量晶圆处理界面"""
@@ -116,15 +337,24 @@ class BatchWaferUI(QWidget):
         super().__init__(parent)
         self.main_window = parent
         self.files_data = []  # 存储所有文件数据 (data, filename, file_path)
+        self._path_index = {}  # 文件路径 -> files_data 中的位置
+        self.current_folder = None  # 当前加载的数据文件夹
+        self.data_dtype = np.float64  # 批量数据存储精度（修改结果会写回磁盘，须保持双精度）
         self.current_page = 0
         self.per_page = 25  # 每页显示25个晶圆
         self.wafer_size = 150  # 默认尺寸
         self.unified_scale = False
         self.unified_vmin = None
         self.unified_vmax = None
-        self.miniatures = []  # 存储所有缩略图对象
+        self.miniatures = []  # 存储当前页显示的缩略图对象
+        self.miniature_pool = []  # 可复用的缩略图控件（按网格位置排列）
         self.pending_update = None  # 等待应用的更新
         self.pending_update_path = None  # 等待更新的文件路径
+        self.batch_thread = None  # 正在进行的批量处理线程
+        
+        # 扩大位图缓存，使翻页时可以直接复用已渲染的缩略图
+        if QPixmapCache.cacheLimit() < _MINIATURE_CACHE_LIMIT_KB:
+            QPixmapCache.setCacheLimit(_MINIATURE_CACHE_LIMIT_KB)
         
         # UI初始化
         self.init_ui()
@@ -273,6 +503,10 @@ class BatchWaferUI(QWidget):
     def load_folder_data(self, folder):
         """加载文件夹中的所有CSV文件，自动选择最新版本的优先级文件"""
         self.files_data = []
+        self.current_folder = folder
+
+        # 文件内容可能已变化，之前渲染的缩略图不再使用
+        WaferMiniature.invalidate_cache()
 
         # 获取文件优先级信息
         priority_info = get_file_priority_info(folder)
@@ -297,7 +531,10 @@ class BatchWaferUI(QWidget):
         # 逐文件加载
         for i, file_path in enumerate(selected_files):
             try:
-                data, filename = load_wafer_data(file_path)
+                # 缓存以存储精度只读映射，按需分页读取，不复制数据
+                data, filename = load_wafer_data_cached(
+                    file_path, dtype=self.data_dtype, mmap_mode='r'
+                )
                 self.files_data.append((data, filename, file_path))
                 self.main_window.update_status_message(
                     f"加载进度: {i+1}/{total} - {filename}"
@@ -308,6 +545,8 @@ class BatchWaferUI(QWidget):
                 )
                 continue
 
+        self._path_index = {fpath: i for i, (_, _, fpath) in enumerate(self.files_data)}
+
         self.main_window.update_status_message(
             f"成功加载 {len(self.files_data)}/{total} 个晶圆数据文件"
         )
@@ -315,6 +554,22 @@ class BatchWaferUI(QWidget):
         # 存储是否存在已处理文件的信息
         self.has_processed_files = has_error_deleted_files
 
+    def clear_data_cache(self):
+        """清除当前文件夹的数据解析缓存（手动编辑CSV后使用）"""
+        if not self.current_folder:
+            QMessageBox.information(self, "提示", "请先在批量处理页面加载数据")
+            return
+
+        # 先把映射的数据读入内存，释放缓存文件的映射（Windows 下映射中的文件无法删除）
+        self.files_data = [
+            (np.array(data), filename, file_path)
+            for data, filename, file_path in self.files_data
+        ]
+        if self.files_data:
+            self.update_display()  # 缩略图改为引用内存中的数据（缩略图图像缓存仍然有效）
+        removed = clear_wafer_data_cache(self.current_folder)
+        self.main_window.update_status_message(f"已清除 {removed} 个数据解析缓存文件")
+
     def show_file_priority_notification(self, version_details, has_error_deleted_files=False):
         """显示文件优先级选择通知"""
         if not version_details:
@@ -371,11 +626,12 @@ class BatchWaferUI(QWidget):
         multi_round_files = 0
 
         for _, filename, _ in self.files_data:
-            if '_error_deleted' not in filename:
+            match = _ERROR_DELETED_RX.search(filename)
+            if match is None:
                 original_files += 1
-            elif filename.endswith('_error_deleted.csv'):
+            elif match.group(1) == '.csv':
                 first_round_files += 1
-            elif '_error_deleted_round' in filename:
+            elif match.group(1) == '_round':
                 multi_round_files += 1
 
         processed_files = first_round_files + multi_round_files
@@ -416,25 +672,29 @@ class BatchWaferUI(QWidget):
         """检测所有晶圆数据中的异常值"""
         outliers_info = {}  # {filename: {outlier_indices: [], outlier_count: int}}
 
-        for data, filename, file_path in self.files_data:
-            if data is None or len(data) < 3:
-                continue
+        valid_files = [
+            (data, filename, file_path)
+            for data, filename, file_path in self.files_data
+            if data is not None and len(data) >= 3
+        ]
+        if not valid_files:
+            return outliers_info
 
-            # 提取厚度数据
-            thickness_values = data[:, 2]
+        # 将各晶圆厚度数据拼接为一维数组，offsets 记录每片晶圆的起止位置
+        lengths = [len(data) for data, _, _ in valid_files]
+        offsets = np.zeros(len(valid_files) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        z_concat = np.concatenate([data[:, 2] for data, _, _ in valid_files])
 
-            # 计算四分位数和四分位距
-            q1 = np.percentile(thickness_values, 25)
-            q3 = np.percentile(thickness_values, 75)
-            iqr = q3 - q1
+        # 批量计算各晶圆的异常值边界与掩码（numba 内核在首次检测时才导入）
+        from core.batch_kernels import detect_iqr_outliers_batch
+        bounds, outlier_mask = detect_iqr_outliers_batch(z_concat, offsets)
 
-            # 计算异常值边界
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
+        for i, (data, filename, file_path) in enumerate(valid_files):
+            lower_bound, upper_bound = bounds[i]
 
             # 找出异常值的索引
-            outlier_mask = (thickness_values < lower_bound) | (thickness_values > upper_bound)
-            outlier_indices = np.where(outlier_mask)[0]
+            outlier_indices = np.flatnonzero(outlier_mask[offsets[i]:offsets[i + 1]])
             outlier_count = len(outlier_indices)
 
             # 如果有异常值，记录信息
@@ -496,6 +756,7 @@ class BatchWaferUI(QWidget):
     def remove_outliers(self, outliers_info, is_manual_trigger=False):
         """剔除异常值并保存为新文件"""
         processed_files = []
+        save_tasks = []  # [(wafer_name, cleaned_data, new_file_path, base_name, new_filename)]
 
         for wafer_name, info in outliers_info.items():
             try:
@@ -525,21 +786,44 @@ class BatchWaferUI(QWidget):
                     new_filename = f"{base_name}_error_deleted.csv"
 
                 new_file_path = os.path.join(directory, new_filename)
+                save_tasks.append((wafer_name, cleaned_data, new_file_path, base_name, new_filename))
 
-                # 保存处理后的数据
-                if self.save_modified_data(cleaned_data, new_file_path):
-                    processed_files.append((base_name, new_filename))
+            except Exception as e:
+                if hasattr(self, 'main_window') and self.main_window:
+                    self.main_window.update_status_message(
+                        f"处理 {wafer_name} 时出错: {str(e)}", "error"
+                    )
+
+        # 并行保存处理后的数据（各文件写入相互独立），状态更新仍在主线程中进行
+        if save_tasks:
+            saved = {}
+            max_workers = min(8, os.cpu_count() or 1, len(save_tasks))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(self._write_data_file, cleaned_data, new_file_path): task_idx
+                    for task_idx, (_, cleaned_data, new_file_path, _, _) in enumerate(save_tasks)
+                }
+                for future in as_completed(futures):
+                    task_idx = futures[future]
+                    wafer_name, _, _, base_name, new_filename = save_tasks[task_idx]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        if hasattr(self, 'main_window') and self.main_window:
+                            self.main_window.update_status_message(
+                                f"处理 {wafer_name} 时出错: 保存失败: {str(e)}", "error"
+                            )
+                        continue
+
+                    saved[task_idx] = (base_name, new_filename)
                     # 更新状态消息
                     if hasattr(self, 'main_window') and self.main_window:
                         self.main_window.update_status_message(
                             f"已处理 {base_name} 的异常值，保存为 {new_filename}"
                         )
 
-            except Exception as e:
-                if hasattr(self, 'main_window') and self.main_window:
-                    self.main_window.update_status_message(
-                        f"处理 {wafer_name} 时出错: {str(e)}", "error"
-                    )
+            # 按原始顺序整理处理结果
+            processed_files = [saved[task_idx] for task_idx in sorted(saved)]
 
         # 显示处理结果
         if processed_files:
@@ -600,13 +884,19 @@ class BatchWaferUI(QWidget):
         """切换统一颜色范围模式"""
         self.unified_scale = (state == Qt.Checked)
         
-        # 应用统一颜色范围
+        # 应用统一颜色范围（仅更新颜色映射，批量更新期间暂停重绘）
         if self.unified_scale and self.unified_vmin is not None and self.unified_vmax is not None:
-            for miniature in self.miniatures:
-                miniature.set_unified_norm(self.unified_vmin, self.unified_vmax)
+            norm = mpl.colors.Normalize(self.unified_vmin, self.unified_vmax)
         else:
+            norm = None
+        
+        self.grid_widget.setUpdatesEnabled(False)
+        try:
             for miniature in self.miniatures:
-                miniature.clear_unified_norm()
+                miniature.set_norm_only(norm)
+        finally:
+            self.grid_widget.setUpdatesEnabled(True)
+            self.grid_widget.update()
     
     def apply_unified_scale(self):
         """应用手动输入的统一颜色范围"""
@@ -619,8 +909,14 @@ class BatchWaferUI(QWidget):
                 
             # 如果当前启用了统一颜色模式，立即更新
             if self.unified_scale:
-                for miniature in self.miniatures:
-                    miniature.set_unified_norm(self.unified_vmin, self.unified_vmax)
+                norm = mpl.colors.Normalize(self.unified_vmin, self.unified_vmax)
+                self.grid_widget.setUpdatesEnabled(False)
+                try:
+                    for miniature in self.miniatures:
+                        miniature.set_norm_only(norm)
+                finally:
+                    self.grid_widget.setUpdatesEnabled(True)
+                    self.grid_widget.update()
                     
         except Exception as e:
             QMessageBox.warning(self, "输入错误", str(e))
@@ -646,38 +942,28 @@ class BatchWaferUI(QWidget):
             self.grid_layout.addWidget(no_data_label, 0, 0, 5, 5)
             return
         
-        # 显示当前页的晶圆小图 (5x5网格)
-        self.miniatures = []
-        for idx in range(start_idx, end_idx):
+        # 统一颜色范围
+        unified_range = None
+        if self.unified_scale and self.unified_vmin is not None and self.unified_vmax is not None:
+            unified_range = (self.unified_vmin, self.unified_vmax)
+        
+        # 显示当前页的晶圆小图 (5x5网格)，优先复用已创建的控件
+        for slot, idx in enumerate(range(start_idx, end_idx)):
             data, filename, file_path = self.files_data[idx]
             
-            # 网格位置
-            row = (idx - start_idx) // 5  # 每行5个晶圆
-            col = (idx - start_idx) % 5
-            
-            # 创建小图控件
-            miniature = WaferMiniature(
-                data, 
-                filename, 
-                wafer_size=self.wafer_size,
-                parent=self.grid_widget
-            )
-            
-            # 设置上下文菜单支持
-            miniature.setContextMenuPolicy(Qt.CustomContextMenu)
-            miniature.customContextMenuRequested.connect(
-                lambda pos, fpath=file_path, data=data: self.show_context_menu(pos, fpath)
-            )
-            
-            # 双击事件
-            miniature.mpl_connect('button_press_event', 
-                                 lambda event, fpath=file_path: self.on_miniature_click(event, fpath))
-            
-            # 绘制前设置统一颜色范围
-            if self.unified_scale and self.unified_vmin is not None and self.unified_vmax is not None:
-                miniature.set_unified_norm(self.unified_vmin, self.unified_vmax)
+            if slot < len(self.miniature_pool):
+                miniature = self.miniature_pool[slot]
+                miniature.set_wafer(data, filename, file_path, self.wafer_size, unified_range)
+            else:
+                miniature = self._create_miniature(data, filename, file_path, unified_range)
+                
+                # 网格位置
+                row = slot // 5  # 每行5个晶圆
+                col = slot % 5
+                self.grid_layout.addWidget(miniature, row, col)
+                self.miniature_pool.append(miniature)
             
-            self.grid_layout.addWidget(miniature, row, col)
+            miniature.setVisible(True)
             self.miniatures.append(miniature)
         
         # 刷新显示
@@ -698,13 +984,42 @@ class BatchWaferUI(QWidget):
             from PyQt5.QtCore import QTimer
             QTimer.singleShot(100, lambda: self._detect_and_show_outliers(first_load_flag))
     
+    def _create_miniature(self, data, filename, file_path, unified_range=None):
+        """创建缩略图控件并绑定交互事件（控件在翻页时复用）"""
+        miniature = WaferMiniature(
+            data, 
+            filename, 
+            wafer_size=self.wafer_size,
+            parent=self.grid_widget,
+            file_path=file_path,
+            unified_range=unified_range
+        )
+        
+        # 设置上下文菜单支持（文件路径在复用时会变化，因此在事件发生时读取）
+        miniature.setContextMenuPolicy(Qt.CustomContextMenu)
+        miniature.customContextMenuRequested.connect(
+            lambda pos, m=miniature: self.show_context_menu(pos, m.file_path)
+        )
+        
+        # 双击事件
+        miniature.double_clicked.connect(lambda m=miniature: self.on_miniature_double_click(m.file_path))
+        return miniature
+    
     def clear_grid(self):
-        """清除5x5网格中的内容"""
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
+        """清除5x5网格中的内容：隐藏可复用的缩略图，删除其他控件及布局项（间隔、伸缩项等）"""
+        for miniature in self.miniature_pool:
+            miniature.setVisible(False)
+        self.miniatures = []
+        
+        for i in reversed(range(self.grid_layout.count())):
+            widget = self.grid_layout.itemAt(i).widget()
+            if widget is not None and widget in self.miniature_pool:
+                continue
+            item = self.grid_layout.takeAt(i)
+            if widget is not None:
                 widget.deleteLater()
+            elif item.layout() is not None:
+                item.layout().deleteLater()
     
     def prev_page(self):
         """跳转到上一页"""
@@ -724,13 +1039,12 @@ class BatchWaferUI(QWidget):
             self.current_page += 1
             self.update_display()
     
-    def on_miniature_click(self, event, file_path):
-        """处理晶圆缩略图点击事件"""
-        if event.dblclick:  # 双击
-            # 发送文件路径到单片处理窗口
-            if self.main_window and hasattr(self.main_window, 'single_wafer_tab'):
-                self.main_window.single_wafer_tab.load_file_directly(file_path, self.wafer_size)
-                self.main_window.tab_widget.setCurrentIndex(0)  # 切换到单片视图
+    def on_miniature_double_click(self, file_path):
+        """处理晶圆缩略图双击事件"""
+        # 发送文件路径到单片处理窗口
+        if self.main_window and hasattr(self.main_window, 'single_wafer_tab'):
+            self.main_window.single_wafer_tab.load_file_directly(file_path, self.wafer_size)
+            self.main_window.tab_widget.setCurrentIndex(0)  # 切换到单片视图
     
     def show_context_menu(self, global_pos, file_path):
         """显示上下文菜单：更新回批量视图"""
@@ -762,22 +1076,19 @@ class BatchWaferUI(QWidget):
             print(f"Ignoring invalid update data for {file_path}")
             return
         
-        self.pending_update = data
+        self.pending_update = np.ascontiguousarray(data)
         self.pending_update_path = file_path
     
     def update_file_data(self, file_path, new_data):
         """更新指定文件的数据"""
-        updated = False
+        idx = self._path_index.get(file_path)
         
-        for i, (_, _, fpath) in enumerate(self.files_data):
-            if fpath == file_path:
-                # 更新文件名（保留原始文件名）
-                filename = self.files_data[i][1]
-                self.files_data[i] = (new_data, filename, file_path)
-                updated = True
-                break
-        
-        if updated:
+        if idx is not None:
+            # 更新数据（保留原始文件名）
+            filename = self.files_data[idx][1]
+            self.files_data[idx] = (np.asarray(new_data, dtype=self.data_dtype), filename, file_path)
+            WaferMiniature.invalidate_cache(file_path)  # 只让该文件已缓存的缩略图失效
+            
             # 显示更新通知
             msg = f"已更新 {os.path.basename(file_path)} 的数据"
             if hasattr(self, 'main_window') and self.main_window:
@@ -800,108 +1111,209 @@ class BatchWaferUI(QWidget):
         return self.files_data
     
     # 核心方法 - 添加必要的参数
-    def process_batch_files(self, stats_data, operation, operation_type, 
+    def create_batch_thread(self, stats_data, operation, operation_type,
                             method, start_point_type, operation_param, range_value):
         """
+        创建批量处理线程（由调用方连接结果信号后启动），状态消息转发到主窗口状态栏
+
+        返回: BatchProcessThread，已有批量处理正在进行时返回 None
+        """
+        if self.batch_thread is not None and self.batch_thread.isRunning():
+            return None
+        
+        # 线程由本界面持有，对话框关闭后处理仍可安全完成
+        self.batch_thread = BatchProcessThread(
+            self,
+            (stats_data, operation, operation_type, method,
+             start_point_type, operation_param, range_value)
+        )
+        if self.main_window:
+            self.batch_thread.file_done.connect(self.main_window.update_status_message)
+        return self.batch_thread
+    
+    def process_batch_files(self, stats_data, operation, operation_type, 
+                            method, start_point_type, operation_param, range_value,
+                            progress=None):
+        """
         根据统计信息批量处理文件夹中的所有文件中的数据点,
         仅当文件中有实际修改时才生成新文件
+
+        progress: 接收 (消息, 类型) 的状态回调，默认直接更新主窗口状态栏；
+        在工作线程中调用时应传入信号的 emit
         """
         modified_files = []
         
         if not self.files_data:
             return modified_files
             
-        # 获取父窗口用于状态更新
-        main_window = getattr(self, 'main_window', None)
-        total_files = len(self.files_data)
-        processed_count = 0
+        # 状态更新回调
+        if progress is None:
+            main_window = getattr(self, 'main_window', None)
+            progress = main_window.update_status_message if main_window else None
         
+        # 收集有统计信息的文件
+        tasks = []
         for idx, (data, filename, file_path) in enumerate(self.files_data):
             # 如果没有该文件的统计信息，跳过
             file_stem = os.path.splitext(filename)[0]
             if file_stem not in stats_data:
                 continue
-                
-            stats = stats_data[file_stem]
-            
-            # 提取厚度数据
-            z = data[:, 2]
-            
-            # 根据方法类型计算边界
-            if method == "relative":
-                # 相对范围模式
-                if start_point_type == "max":
-                    min_bound = stats['start_value'] - range_value
-                    max_bound = stats['start_value']
-                else:  # min
-                    min_bound = stats['start_value']
-                    max_bound = stats['start_value'] + range_value
-            else:
-                # 绝对范围模式
-                if isinstance(range_value, tuple) and len(range_value) == 2:
-                    min_bound, max_bound = range_value
-                else:
-                    # 无效范围，跳过此文件
+            tasks.append((idx, data, file_path, stats_data[file_stem]))
+        
+        if not tasks:
+            return modified_files
+        
+        # 操作类型对整批文件相同，在循环外选定处理函数（numba 内核在首次批量操作时才导入）
+        from core.batch_kernels import select_batch_operation
+        kernel = select_batch_operation(operation, operation_type, operation_param)
+        if kernel is None:
+            return modified_files  # 无效操作
+        
+        # 各文件的处理相互独立（NumPy 运算期间会释放 GIL），使用线程池并行处理并编码结果；
+        # 磁盘写入交给独立的写盘线程，与后续文件的计算重叠进行。状态更新在当前线程中进行
+        saved = {}
+        pending_writes = deque()  # (文件序号, 保存路径, 写入 future, 状态消息)，按提交顺序
+        
+        def finish_write(entry):
+            idx, save_path, write_future, status_msg = entry
+            try:
+                write_future.result()
+                saved[idx] = save_path
+            except Exception as e:
+                status_msg = (f"保存失败: {str(e)}", "error")
+            if progress:
+                progress(*status_msg)
+        
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(tasks))) as pool, \
+                ThreadPoolExecutor(max_workers=_WRITER_THREADS) as writer:
+            futures = {
+                pool.submit(
+                    self._process_one_file, data, file_path, stats, kernel,
+                    method, start_point_type, operation_param, range_value
+                ): idx
+                for idx, data, file_path, stats in tasks
+            }
+            for future in as_completed(futures):
+                idx = futures.pop(future)  # 释放 future 持有的编码结果
+                save_path, encoded, status_msg = future.result()
+                if encoded is None:
+                    if progress and status_msg:
+                        progress(*status_msg)
                     continue
-            
-            # 创建数据掩码
-            mask = (z >= min_bound) & (z <= max_bound)
-            
-            # 根据操作类型处理数据
-            if operation == 'modify' and operation_param is not None:
-                # 检查是否实际有变化
-                if np.any(data[mask, 2] != operation_param):
-                    modified_data = data.copy()
-                    modified_data[mask, 2] = operation_param
-                    do_processing = True  # 标记为需要处理
-                else:
-                    do_processing = False  # 没有实际变化
-            elif operation == 'delete':
-                if operation_type == "in_range":
-                    # 如果范围外所有点都已存在, 表示无变化
-                    if np.any(mask):
-                        modified_data = data[~mask]  # 保留范围外的点
-                        do_processing = True
-                    else:
-                        do_processing = False
-                else:  # out_of_range
-                    # 如果范围内所有点都未删除, 表示无变化
-                    if np.any(~mask):
-                        modified_data = data[mask]   # 保留范围内的点
-                        do_processing = True
-                    else:
-                        do_processing = False
-            else:
-                # 无效操作，跳过
-                continue
-            
-            # 只有当文件中有实际修改时才保存
-            if do_processing:
-                # 保存修改后的文件
-                base_name = os.path.splitext(os.path.basename(file_path))[0]
-                save_path = os.path.join(
-                    os.path.dirname(file_path),
-                    f"{base_name}_modified.csv"  # 添加modified后缀
-                )
                 
-                # 保存文件
-                if self.save_modified_data(modified_data, save_path):
-                    modified_files.append(save_path)
-                    processed_count += 1
-                    
-                    # 更新状态
-                    if main_window:
-                        main_window.update_status_message(
-                            f"已修改并保存: {base_name}"
-                        )
+                # 等待写盘的文件过多时先完成最早的写入
+                if len(pending_writes) >= _MAX_PENDING_WRITES:
+                    finish_write(pending_writes.popleft())
+                pending_writes.append(
+                    (idx, save_path, writer.submit(self._write_encoded, save_path, encoded), status_msg)
+                )
             
+            while pending_writes:
+                finish_write(pending_writes.popleft())
+        
+        # 按文件加载顺序返回结果
+        modified_files = [saved[idx] for idx in sorted(saved)]
         return modified_files   
     
+    def _process_one_file(self, data, file_path, stats, kernel,
+                          method, start_point_type, operation_param, range_value):
+        """
+        处理单个文件的数据点并编码修改结果（不涉及界面操作，可在工作线程中调用）
+        
+        kernel: select_batch_operation 选出的处理函数
+        
+        返回: (保存路径, 编码结果, 状态消息)，编码结果可交给 _write_encoded 写盘；
+        未修改或处理失败时保存路径和编码结果为 None，状态消息为 (消息, 类型) 或 None
+        """
+        # 统一为连续的 float64 存储精度数组（加载时已转换的数据不会复制），比较与写入按该精度进行；
+        # 从缓存加载的只读内存映射需复制为可写数组，编译内核的签名只接受可写数组
+        if data.flags.writeable:
+            data = np.ascontiguousarray(data, dtype=self.data_dtype)
+        else:
+            data = np.array(data, dtype=self.data_dtype)
+        
+        # 按列处理数据（各列均为视图，修改时只复制厚度列）
+        x = data[:, 0]
+        y = data[:, 1]
+        z = data[:, 2]
+        
+        # 根据方法类型计算边界
+        if method == "relative":
+            # 相对范围模式
+            if start_point_type == "max":
+                min_bound = stats['start_value'] - range_value
+                max_bound = stats['start_value']
+            else:  # min
+                min_bound = stats['start_value']
+                max_bound = stats['start_value'] + range_value
+        else:
+            # 绝对范围模式
+            if isinstance(range_value, tuple) and len(range_value) == 2:
+                min_bound, max_bound = range_value
+            else:
+                # 无效范围，跳过此文件
+                return None, None, None
+        
+        # 边界与参数统一为存储精度，范围判断与写入在编译内核中一次完成
+        cast = z.dtype.type
+        if operation_param is not None:
+            operation_param = cast(operation_param)
+        modified_columns = kernel(x, y, z, cast(min_bound), cast(max_bound), operation_param)
+        
+        # 只有当文件中有实际修改时才保存
+        if modified_columns is None:
+            return None, None, None
+        
+        # 编码修改后的文件（写盘由调用方完成）
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        save_path = os.path.join(
+            os.path.dirname(file_path),
+            f"{base_name}_modified.csv"  # 添加modified后缀
+        )
+        
+        try:
+            encoded = self._encode_columns(*modified_columns)
+        except Exception as e:
+            return None, None, (f"保存失败: {str(e)}", "error")
+        return save_path, encoded, (f"已修改并保存: {base_name}", "info")
+    
+    def _write_data_file(self, data, file_path):
+        """将数据写入CSV文件（不涉及界面操作，可在工作线程中调用）"""
+        data = np.asarray(data)
+        self._write_columns(file_path, data[:, 0], data[:, 1], data[:, 2])
+
+    def _write_columns(self, file_path, x, y, thickness):
+        """将 x、y、厚度三列数据写入CSV文件"""
+        self._write_encoded(file_path, self._encode_columns(x, y, thickness))
+
+    def _encode_columns(self, x, y, thickness):
+        """
+        将 x、y、厚度三列编码为 (CSV文本, 解析缓存数组)（按列交错取值，无需先拼成二维数组）
+        """
+        values = [None] * (3 * len(thickness))
+        values[0::3] = x.tolist()
+        values[1::3] = y.tolist()
+        values[2::3] = thickness.tolist()
+        # 缺失值（NaN）与 DataFrame.to_csv 一致写为空字段
+        if np.isnan(x).any() or np.isnan(y).any() or np.isnan(thickness).any():
+            values = ['' if v != v else v for v in values]
+        text = (_CSV_HEADER + '\n' + _CSV_ROW_FMT * len(thickness)) % tuple(values)
+        return text, np.column_stack((x, y, thickness))
+
+    def _write_encoded(self, file_path, encoded):
+        """将 _encode_columns 的结果写入CSV文件（只做磁盘写入，可在工作线程中调用）"""
+        text, table = encoded
+        with open(file_path, 'w') as f:
+            f.write(text)
+
+        # 同时写出解析缓存（含缺失值时解析结果会丢弃这些行，交给下次加载时解析）
+        if not np.isnan(table).any():
+            save_wafer_data_cache(file_path, table)
+
     def save_modified_data(self, data, file_path):
         """保存修改后的数据到文件"""
         try:
-            df = pd.DataFrame(data, columns=['x', 'y', 'thickness'])
-            df.to_csv(file_path, index=False)
+            self._write_data_file(data, file_path)
             return True
         except Exception as e:
             if hasattr(self, 'main_window') and self.main_window:
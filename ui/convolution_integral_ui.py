@@ -4,11 +4,32 @@ from PyQt5.QtWidgets import (
     QScrollArea, QSplitter, QComboBox, 
     QDoubleSpinBox, QCheckBox, QMessageBox
 )
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QPixmap, QPainter, QFont
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import copy
 import os
 import time
-from core.convolution_engine import ConvolutionEngine
+import threading
+from functools import lru_cache
+from core.convolution_engine import ConvolutionEngine, ConvolutionCancelled
+
+@lru_cache(maxsize=None)
+def _loading_png_bytes():
+    """加载中图片的PNG字节数据（只渲染一次）"""
+    import matplotlib.pyplot as plt
+    from io import BytesIO
+    
+    plt.figure(figsize=(6, 4))
+    plt.text(0.5, 0.5, "计算中...", 
+            ha='center', va='center', fontsize=24, color='blue')
+    plt.axis('off')
+    
+    buffer = BytesIO()
+    plt.savefig(buffer, dpi=150, format='png', bbox_inches='tight')
+    plt.close()
+    
+    buffer.seek(0)
+    return buffer.getvalue()
 
 class ConvolutionThread(QThread):
     finished = pyqtSignal(str, str)  # signal for (image_path, status)
@@ -19,17 +40,25 @@ class ConvolutionThread(QThread):
         self.engine = engine
         self.dwell_file = dwell_file
         self.ion_file = ion_file
+        self._cancel = threading.Event()  # 协作式取消标志，由引擎在各处理阶段之间检查
+
+    def cancel(self):
+        """请求取消计算（线程在当前处理阶段结束后退出，不发送结果信号）"""
+        self._cancel.set()
 
     def run(self):
         try:
             start_time = time.time()
             heatmap_path, csv_path = self.engine.process_etch_depth(
                 self.dwell_file, 
-                self.ion_file
+                self.ion_file,
+                cancel_event=self._cancel
             )
             elapsed = time.time() - start_time
             status = f"计算完成 (耗时: {elapsed:.2f}秒)"
             self.finished.emit(heatmap_path, status)
+        except ConvolutionCancelled:
+            pass
         except Exception as e:
             self.error.emit(str(e))
 
@@ -43,6 +72,7 @@ class ConvolutionIntegralUI(QWidget):
         self.current_ion_file = None
         self.init_ui()
         self.worker_thread = None
+        self._retired_threads = []  # 已取消、仍在后台结束当前阶段的计算线程（保持引用直到退出）
     
     def init_ui(self):
         # 主布局 - 左右分栏
@@ -229,6 +259,16 @@ class ConvolutionIntegralUI(QWidget):
             return
             
         try:
+            # 取消仍在进行的计算：断开其结果信号，让其在后台结束当前阶段后退出，不阻塞界面等待；
+            # 新的计算使用引擎的副本（共享设置与文件解析缓存），两个线程不会同时修改同一引擎
+            if self.worker_thread and self.worker_thread.isRunning():
+                self.worker_thread.cancel()
+                self.worker_thread.finished.disconnect()
+                self.worker_thread.error.disconnect()
+                self._retired_threads.append(self.worker_thread)
+                self.engine = copy.copy(self.engine)
+            self._retired_threads = [t for t in self._retired_threads if t.isRunning()]
+            
             # 更新圆形设置
             diameter = float(self.diameter_cb.currentText())
             center_x = self.center_x_input.value()
@@ -252,9 +292,6 @@ class ConvolutionIntegralUI(QWidget):
             self.etch_label.setPixmap(loading_img)
             
             # 使用工作线程避免阻塞UI
-            if self.worker_thread and self.worker_thread.isRunning():
-                self.worker_thread.terminate()
-                
             self.worker_thread = ConvolutionThread(
                 self.engine, 
                 self.current_dwell_file, 
@@ -269,21 +306,8 @@ class ConvolutionIntegralUI(QWidget):
             self.on_calculation_error(str(e))
     
     def _create_loading_image(self):
-        """创建加载中图片的字节数据"""
-        import matplotlib.pyplot as plt
-        from io import BytesIO
-        
-        plt.figure(figsize=(6, 4))
-        plt.text(0.5, 0.5, "计算中...", 
-                ha='center', va='center', fontsize=24, color='blue')
-        plt.axis('off')
-        
-        buffer = BytesIO()
-        plt.savefig(buffer, dpi=150, format='png', bbox_inches='tight')
-        plt.close()
-        
-        buffer.seek(0)
-        return buffer.getvalue()
+        """获取加载中图片的字节数据"""
+        return _loading_png_bytes()
     
     def on_calculation_finished(self, heatmap_path, status):
         # 更新进度标签
@@ -320,26 +344,22 @@ class ConvolutionIntegralUI(QWidget):
         # 显示错误信息
         self.result_label.setText(f"错误: {error_message}")
         
-        # 保存错误图像到缓存
-        error_img = QPixmap()
-        error_img.loadFromData(self._create_error_image(error_message))
-        self.etch_label.setPixmap(error_img)
+        # 显示错误图像
+        self.etch_label.setPixmap(self._create_error_image(error_message))
         
         QMessageBox.critical(self, "计算错误", f"卷积积分过程中出错:\n{error_message}")
     
     def _create_error_image(self, error_message):
-        """创建错误信息的图片字节数据"""
-        import matplotlib.pyplot as plt
-        from io import BytesIO
-        
-        plt.figure(figsize=(6, 4))
-        plt.text(0.5, 0.5, f"错误:\n{error_message}", 
-                ha='center', va='center', fontsize=14, color='red')
-        plt.axis('off')
-        
-        buffer = BytesIO()
-        plt.savefig(buffer, dpi=150, format='png', bbox_inches='tight')
-        plt.close()
-        
-        buffer.seek(0)
-        return buffer.getvalue()
+        """直接用 QPainter 绘制错误信息图片"""
+        pixmap = QPixmap(600, 400)
+        pixmap.fill(Qt.white)
+        
+        painter = QPainter(pixmap)
+        font = QFont()
+        font.setPointSize(14)
+        painter.setFont(font)
+        painter.setPen(Qt.red)
+        painter.drawText(pixmap.rect(), Qt.AlignCenter | Qt.TextWordWrap, f"错误:\n{error_message}")
+        painter.end()
+        
+        return pixmap
@@ -1,10 +1,97 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QDialogButtonBox,
-                             QDoubleSpinBox, QGroupBox, QGridLayout, QPushButton, QMessageBox,
+                             QGroupBox, QGridLayout, QPushButton, QMessageBox,
                              QFormLayout, QSpinBox
 )
 from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtCore import Qt
+from functools import lru_cache
+import re
+
+# 数字（可带符号、小数和指数）及 "x,y" 坐标的输入格式，一次匹配完成校验和提取
+_NUMBER = r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?'
+_NUMBER_RE = re.compile(rf'\s*({_NUMBER})\s*')
+_POINT_RE = re.compile(rf'\s*({_NUMBER})\s*,\s*({_NUMBER})\s*')
+
+@lru_cache(maxsize=None)
+def _shared_double_validator(bottom, top, decimals):
+    """按范围和精度共享的 QDoubleValidator（首次使用时创建，供各对话框的输入框复用）"""
+    # 保持 QDoubleValidator 默认的 ScientificNotation，与 _NUMBER_RE 一样接受指数形式
+    return QDoubleValidator(bottom, top, decimals)
+
+class DoubleLineEdit(QLineEdit):
+    """
+    轻量的数值输入框，提供与 QDoubleSpinBox 相同的 setRange/setDecimals/setValue/value 接口
+    （无步进按钮，构造开销远小于 QDoubleSpinBox）
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bottom = 0.0
+        self._top = 99.99
+        self._decimals = 2
+        self._value = 0.0
+        self._suffix_label = None
+        self._update_validator()
+        self.setText(self._format(self._value))
+
+    def _update_validator(self):
+        self.setValidator(_shared_double_validator(self._bottom, self._top, self._decimals))
+
+    def _format(self, value):
+        return f"{value:.{self._decimals}f}"
+
+    def _clamp(self, value):
+        return round(min(max(value, self._bottom), self._top), self._decimals)
+
+    def setRange(self, bottom, top):
+        self._bottom = float(bottom)
+        self._top = float(top)
+        self._update_validator()
+        self.setValue(self._value)
+
+    def setDecimals(self, decimals):
+        self._decimals = int(decimals)
+        self._update_validator()
+        self.setValue(self._value)
+
+    def setValue(self, value):
+        self._value = self._clamp(float(value))
+        self.setText(self._format(self._value))
+
+    def setSuffix(self, suffix):
+        """在输入框右侧显示单位（不属于文本内容，不影响校验和取值）"""
+        if self._suffix_label is None:
+            self._suffix_label = QLabel(self)
+            self._suffix_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._suffix_label.setText(suffix)
+        width = self._suffix_label.sizeHint().width()
+        self.setTextMargins(0, 0, width + 4, 0)
+        self._place_suffix()
+
+    def _place_suffix(self):
+        if self._suffix_label is not None:
+            width = self._suffix_label.sizeHint().width()
+            self._suffix_label.setGeometry(self.width() - width - 4, 0, width, self.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_suffix()
+
+    def value(self):
+        """返回当前数值（输入不完整时使用上一次的有效值，超出范围时限制在范围内并同步显示文本）"""
+        try:
+            self._value = self._clamp(float(self.text()))
+        except ValueError:
+            pass
+        text = self._format(self._value)
+        if self.text() != text:
+            self.setText(text)
+        return self._value
+
+    def focusOutEvent(self, event):
+        # 与 QDoubleSpinBox 的 fixup 一致：离开输入框时将文本修正为限制后的数值
+        super().focusOutEvent(event)
+        self.value()
 
 class DataInputDialog(QDialog):
     def __init__(self, parent=None, default_wafer_size=200):
@@ -18,12 +105,12 @@ class DataInputDialog(QDialog):
         # 坐标输入字段
         coord_layout = QHBoxLayout()
         coord_layout.addWidget(QLabel("X坐标 (mm):"))
-        self.x_input = QDoubleSpinBox()
+        self.x_input = DoubleLineEdit()
         self.x_input.setRange(-500, 500)
         coord_layout.addWidget(self.x_input)
         
         coord_layout.addWidget(QLabel("Y坐标 (mm):"))
-        self.y_input = QDoubleSpinBox()
+        self.y_input = DoubleLineEdit()
         self.y_input.setRange(-500, 500)
         coord_layout.addWidget(self.y_input)
         
@@ -32,7 +119,7 @@ class DataInputDialog(QDialog):
         # 膜厚输入
         thick_layout = QHBoxLayout()
         thick_layout.addWidget(QLabel("膜厚 (nm):"))
-        self.thick_input = QDoubleSpinBox()
+        self.thick_input = DoubleLineEdit()
         self.thick_input.setRange(1, 10000)
         self.thick_input.setValue(500)
         thick_layout.addWidget(self.thick_input)
@@ -70,12 +157,12 @@ class RangeSelectDialog(QDialog):
         
         range_layout = QHBoxLayout()
         range_layout.addWidget(QLabel("最小值:"))
-        self.min_input = QDoubleSpinBox()
+        self.min_input = DoubleLineEdit()
         self.min_input.setRange(0, 10000)
         range_layout.addWidget(self.min_input)
         
         range_layout.addWidget(QLabel("最大值:"))
-        self.max_input = QDoubleSpinBox()
+        self.max_input = DoubleLineEdit()
         self.max_input.setRange(0, 10000)
         self.max_input.setValue(1000)
         range_layout.addWidget(self.max_input)
@@ -150,12 +237,12 @@ class NewGridSettingsDialog(QDialog):
         
         # X步长
         self.x_step_input = QLineEdit("10.0")
-        self.x_step_input.setValidator(QDoubleValidator(0.1, 1000, 3, self))
+        self.x_step_input.setValidator(_shared_double_validator(0.1, 1000.0, 3))
         layout.addRow(QLabel("X步长 (mm):"), self.x_step_input)
         
         # Y步长
         self.y_step_input = QLineEdit("10.0")
-        self.y_step_input.setValidator(QDoubleValidator(0.1, 1000, 3, self))
+        self.y_step_input.setValidator(_shared_double_validator(0.1, 1000.0, 3))
         layout.addRow(QLabel("Y步长 (mm):"), self.y_step_input)
         
         # 起始点
@@ -168,34 +255,34 @@ class NewGridSettingsDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addRow(button_box)
     
+    @staticmethod
+    def _parse_step(text):
+        """解析步长，不是大于0的数字时返回 None"""
+        m = _NUMBER_RE.fullmatch(text)
+        if m is None:
+            return None
+        step = float(m.group(1))
+        return step if step > 0 else None
+    
     def validate_and_accept(self):
         # 获取X步长
-        x_step = self.x_step_input.text()
-        try:
-            x_step = float(x_step)
-            if x_step <= 0:
-                raise ValueError
-        except:
+        x_step = self._parse_step(self.x_step_input.text())
+        if x_step is None:
             QMessageBox.warning(self, "步长错误", "X步长必须是大于0的数字")
             return
         
         # 获取Y步长
-        y_step = self.y_step_input.text()
-        try:
-            y_step = float(y_step)
-            if y_step <= 0:
-                raise ValueError
-        except:
+        y_step = self._parse_step(self.y_step_input.text())
+        if y_step is None:
             QMessageBox.warning(self, "步长错误", "Y步长必须是大于0的数字")
             return
         
         # 获取起始点
-        start_point = self.start_point_input.text()
-        try:
-            x_start, y_start = [float(p.strip()) for p in start_point.split(",")]
-        except:
+        m = _POINT_RE.fullmatch(self.start_point_input.text())
+        if m is None:
             QMessageBox.warning(self, "坐标错误", "起始点格式错误，请输入两个数字以逗号分隔（例如：0,0）")
             return
+        x_start, y_start = float(m.group(1)), float(m.group(2))
         
         # 保存结果
         self.result = (x_step, y_step, (x_start, y_start))
@@ -204,6 +291,34 @@ class NewGridSettingsDialog(QDialog):
 
 class AdvancedOptionsDialog(QDialog):
     """高级选项设置对话框"""
+    # 按钮样式（类级常量，只在模块加载时创建一次）
+    _OK_QSS = """
+            QPushButton {
+                background-color: #4caf50;
+                color: white;
+                font-weight: bold;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #45a049;
+            }
+        """
+    _CANCEL_QSS = """
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                font-weight: bold;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #da190b;
+            }
+        """
+    _TITLE_QSS = "font-size: 14px; font-weight: bold; color: #333;"
+    _INFO_QSS = "color: #666; font-size: 15px; margin: 5px 0;"
+
     def __init__(self, transition_width, recipe_range, uniformity_threshold=0.5, speed_threshold=140.0, parent=None):
         super().__init__(parent)
         self.setWindowTitle("高级选项设置")
@@ -216,7 +331,7 @@ class AdvancedOptionsDialog(QDialog):
 
         # 标题
         title = QLabel("高级参数设置")
-        title.setStyleSheet("font-size: 14px; font-weight: bold; color: #333;")
+        title.setStyleSheet(self._TITLE_QSS)
         layout.addWidget(title)
 
         # 过渡区宽度设置
@@ -224,10 +339,9 @@ class AdvancedOptionsDialog(QDialog):
         transition_layout = QHBoxLayout(transition_group)
 
         transition_layout.addWidget(QLabel("过渡区宽度 (mm):"))
-        self.transition_input = QDoubleSpinBox()
+        self.transition_input = DoubleLineEdit()
         self.transition_input.setRange(1.0, 200.0)
         self.transition_input.setValue(transition_width)
-        self.transition_input.setSingleStep(1.0)
         self.transition_input.setSuffix(" mm")
         transition_layout.addWidget(self.transition_input)
 
@@ -252,10 +366,9 @@ class AdvancedOptionsDialog(QDialog):
         uniformity_layout = QHBoxLayout(uniformity_group)
 
         uniformity_layout.addWidget(QLabel("验算均一性阈值 (%):"))
-        self.uniformity_input = QDoubleSpinBox()
+        self.uniformity_input = DoubleLineEdit()
         self.uniformity_input.setRange(0.1, 10.0)
         self.uniformity_input.setValue(uniformity_threshold)
-        self.uniformity_input.setSingleStep(0.1)
         self.uniformity_input.setSuffix(" %")
         self.uniformity_input.setDecimals(2)
         uniformity_layout.addWidget(self.uniformity_input)
@@ -267,10 +380,9 @@ class AdvancedOptionsDialog(QDialog):
         speed_layout = QHBoxLayout(speed_group)
 
         speed_layout.addWidget(QLabel("刻蚀量阈值 (nm):"))
-        self.speed_threshold_input = QDoubleSpinBox()
+        self.speed_threshold_input = DoubleLineEdit()
         self.speed_threshold_input.setRange(50.0, 500.0)
         self.speed_threshold_input.setValue(speed_threshold)
-        self.speed_threshold_input.setSingleStep(10.0)
         self.speed_threshold_input.setSuffix(" nm")
         self.speed_threshold_input.setDecimals(1)
         speed_layout.addWidget(self.speed_threshold_input)
@@ -279,7 +391,7 @@ class AdvancedOptionsDialog(QDialog):
 
         # 说明文字
         info_label = QLabel("提示: 过渡区宽度影响载台速度变化平滑度\nRecipe截取范围决定生成运动指令的有效区域\n刻蚀量阈值决定何时生成倍速扫描Recipe")
-        info_label.setStyleSheet("color: #666; font-size: 15px; margin: 5px 0;")
+        info_label.setStyleSheet(self._INFO_QSS)
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
 
@@ -289,33 +401,11 @@ class AdvancedOptionsDialog(QDialog):
 
         self.ok_btn = QPushButton("确定")
         self.ok_btn.clicked.connect(self.accept)
-        self.ok_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4caf50;
-                color: white;
-                font-weight: bold;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.ok_btn.setStyleSheet(self._OK_QSS)
 
         self.cancel_btn = QPushButton("取消")
         self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-weight: bold;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #da190b;
-            }
-        """)
+        self.cancel_btn.setStyleSheet(self._CANCEL_QSS)
 
         button_layout.addWidget(self.ok_btn)
         button_layout.addWidget(self.cancel_btn)
@@ -4,20 +4,27 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, 
     QLabel, QLineEdit, QPushButton, QDialogButtonBox, QSizePolicy
 )
-from PyQt5.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from scipy.stats import norm
-import matplotlib.pyplot as plt
-import sys
+from PyQt5.QtCore import Qt, QTimer
 
 class DistributionDialog(QDialog):
+    # 数据点少于此数时核密度估计只反映噪声，不绘制实测分布曲线
+    KDE_MIN_SAMPLES = 20
+    # 手动输入组距时允许的最大组数，过小的组距会生成大量柱形导致界面卡死
+    MAX_BINS = 1000
+    
     def __init__(self, thickness_data, parent=None):
         super().__init__(parent)
         self.setWindowTitle("厚度分布统计")
         self.setMinimumSize(800, 600)
+        # 统一转换为连续的 float64 数组（调用方传入的通常是数据表的列视图），
+        # 后续统计和直方图计算不再逐次转换或按步长访问
+        if thickness_data is not None:
+            thickness_data = np.ascontiguousarray(thickness_data, dtype=np.float64).ravel()
         self.thickness_data = thickness_data
         self.current_bin_size = None
+        self._applied_bin_text = None  # 当前直方图对应的组距输入文本（自动组距为回填的文本）
+        self.ax1 = None  # 坐标轴在首次绘图时创建
+        self._stats_ready = False  # 统计量在首次绘图时计算一次
         
         # 主布局
         layout = QVBoxLayout(self)
@@ -34,6 +41,13 @@ class DistributionDialog(QDialog):
         self.bin_size_entry.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         control_layout.addWidget(self.bin_size_entry)
         
+        # 输入组距时延迟更新图表，连续输入只在停顿后重绘一次
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(150)
+        self._debounce.timeout.connect(self._apply_typed_bin_size)
+        self.bin_size_entry.textChanged.connect(lambda _: self._debounce.start())
+        
         self.update_button = QPushButton("更新图表")
         self.update_button.clicked.connect(self.update_histogram)
         control_layout.addWidget(self.update_button)
@@ -47,7 +61,9 @@ class DistributionDialog(QDialog):
         
         layout.addLayout(control_layout)
         
-        # 创建图表控件
+        # 创建图表控件（matplotlib 在首次打开对话框时才导入，不影响程序启动）
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
         self.figure = Figure(figsize=(8, 6))
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
@@ -58,12 +74,125 @@ class DistributionDialog(QDialog):
         # 设置初始焦点
         self.bin_size_entry.setFocus()
     
-    def draw_distribution_stats(self):
-        """绘制统计图表"""
+    def _init_axes(self):
+        """创建图表坐标轴及可复用的图元（更新时只替换数据）"""
         self.figure.clear()
         
+        # 直方图及累积分布
+        self.ax1 = self.figure.add_subplot(211)
+        self.ax2 = self.ax1.twinx()
+        self._hist_bars = None
+        self._cum_line, = self.ax2.plot(
+            [], [],
+            color='orange', 
+            linestyle='--', 
+            linewidth=2,
+            marker='o',
+            markersize=4
+        )
+        self.ax2.set_ylabel('累积概率', rotation=270, labelpad=20)
+        # 数据范围已知，坐标范围手动设置，不让每次绘图都遍历图元重新计算
+        self.ax1.set_autoscale_on(False)
+        self.ax2.set_autoscale_on(False)
+        self.ax2.set_ylim(0, 1.05)
+        self.ax1.set_xlabel("厚度 (nm)")
+        self.ax1.set_ylabel("频率密度")
+        self.ax1.grid(True, linestyle='--', alpha=0.3)
+        
+        # 正态分布拟合
+        self.ax3 = self.figure.add_subplot(212)
+        self._pdf_line, = self.ax3.plot([], [], 'r-', linewidth=2)
+        self._pdf_fill = None
+        self._kde_line, = self.ax3.plot([], [], 'b--', linewidth=1.5, label="实测分布")
+        self.ax3.set_title("正态分布拟合曲线")
+        self.ax3.set_xlabel("厚度 (nm)")
+        self.ax3.set_ylabel("概率密度")
+        self.ax3.grid(True, linestyle='--', alpha=0.3)
+        self.ax3.set_autoscale_on(False)
+        self._stats_text = self.ax3.text(
+            0.98, 0.65, "",
+            transform=self.ax3.transAxes,
+            verticalalignment='top',
+            horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
+            fontsize=10
+        )
+    
+    def _compute_stats(self):
+        """计算与组距无关的统计量（厚度数据在对话框生命周期内不变，只计算一次）"""
+        from core.math_utils import gaussian_kde_fft
+        
+        thickness = self.thickness_data
+        self._mu = np.mean(thickness)
+        self._sigma = np.std(thickness)
+        self._min = np.min(thickness)
+        self._max = np.max(thickness)
+        self._q25, self._q75 = np.percentile(thickness, [25, 75])
+        
+        # 统计信息文字（只依赖厚度数据，随统计量一起生成）
+        self._stats_summary = (
+            f"数据点数: {thickness.size}\n"
+            f"平均值 (μ): {self._mu:.3f} nm\n"
+            f"标准差 (σ): {self._sigma:.3f} nm\n"
+            f"最小值: {self._min:.3f} nm\n"
+            f"最大值: {self._max:.3f} nm"
+        )
+        
+        # 正态分布曲线的取值范围（限制在数据范围内）
+        x_min, x_max = np.clip(
+            [self._mu - 4 * self._sigma, self._mu + 4 * self._sigma], self._min, self._max
+        )
+        self._x = np.linspace(x_min, x_max, 300)
+        # 正态分布概率密度直接用 NumPy 计算，省去 scipy.stats 的参数校验与分派
+        if self._sigma > 0:
+            inv_sigma = 1.0 / self._sigma
+            self._pdf = inv_sigma / np.sqrt(2 * np.pi) * np.exp(-0.5 * ((self._x - self._mu) * inv_sigma) ** 2)
+        else:
+            self._pdf = np.zeros_like(self._x)
+        
+        # 实测数据密度分布（分箱 + FFT 卷积，不随数据点数与取值点数之积增长）
+        self._kde_vals = None
+        if thickness.size >= self.KDE_MIN_SAMPLES:
+            try:
+                self._kde_vals = gaussian_kde_fft(thickness, self._x)
+            except Exception as e:
+                print(f"无法计算KDE: {str(e)}")
+        
+        self._stats_ready = True
+    
+    def _draw_fit(self):
+        """绘制正态分布拟合图（与组距无关，只在创建坐标轴后绘制一次）"""
+        ax3 = self.ax3
+        self._pdf_line.set_data(self._x, self._pdf)
+        if self._pdf_fill is not None:
+            self._pdf_fill.remove()
+        self._pdf_fill = ax3.fill_between(self._x, self._pdf, 0, alpha=0.3, color='red')
+        
+        if self._kde_vals is not None:
+            self._kde_line.set_data(self._x, self._kde_vals)
+            self._kde_line.set_label("实测分布")
+            self._kde_line.set_visible(True)
+        else:
+            self._kde_line.set_data([], [])
+            self._kde_line.set_label("_nolegend_")
+            self._kde_line.set_visible(False)
+        
+        y_max = self._pdf.max()
+        if self._kde_vals is not None:
+            y_max = max(y_max, self._kde_vals.max())
+        if not np.isfinite(y_max) or y_max <= 0:
+            y_max = 1.0  # 数据全部相同（σ=0）时没有可绘制的密度曲线
+        ax3.set_xlim(self._x[0], self._x[-1])
+        ax3.set_ylim(0, y_max * 1.05)
+        ax3.legend()
+        self._stats_text.set_text(self._stats_summary)
+    
+    def draw_distribution_stats(self):
+        """绘制统计图表"""
         if self.thickness_data is None or len(self.thickness_data) < 3:
             # 没有数据的情况
+            self.figure.clear()
+            self.ax1 = None
             ax = self.figure.add_subplot(111)
             ax.text(0.5, 0.5, '至少需要3个数据点才能生成分布统计', 
                     horizontalalignment='center', verticalalignment='center',
@@ -72,128 +201,111 @@ class DistributionDialog(QDialog):
             self.canvas.draw()
             return
         
-        try:
-            # 计算统计信息
-            thickness = self.thickness_data
-            mu = np.mean(thickness)
-            sigma = np.std(thickness)
-            min_val = np.min(thickness)
-            max_val = np.max(thickness)
-            
-            # 获取或计算组距
-            bin_text = self.bin_size_entry.text().strip()
-            if bin_text:
-                try:
-                    bin_size = float(bin_text)
-                    if bin_size <= 0:
-                        raise ValueError
-                except ValueError:
-                    bin_size = None
-            else:
-                bin_size = None
-            
-            if bin_size is None:
-                # 自动计算组距 (Freedman-Diaconis规则)
-                q75, q25 = np.percentile(thickness, [75, 25])
-                iqr = q75 - q25
-                bin_size = 2 * iqr / (len(thickness) ** (1/3)) if iqr > 0 else (max_val - min_val)/10
-                bin_size = max(bin_size, (max_val - min_val)/20)
-                self.bin_size_entry.setText(f"{bin_size:.3f}")
-            
-            bins = np.arange(min_val, max_val + bin_size, bin_size)
-            
-            # 创建直方图
-            ax1 = self.figure.add_subplot(211)
-            n, bins, patches = ax1.hist(
-                thickness, bins=bins, 
-                density=True, edgecolor='black', 
-                alpha=0.7
-            )
-            
-            # 计算累积分布
-            cumulative = np.cumsum(n) * bin_size
-            
-            # 添加累积分布曲线
-            ax2 = ax1.twinx()
-            ax2.plot(
-                bins[:-1], cumulative, 
-                color='orange', 
-                linestyle='--', 
-                linewidth=2,
-                marker='o',
-                markersize=4
-            )
-            ax2.set_ylabel('累积概率', rotation=270, labelpad=20)
-            
-            # 设置直方图属性
-            ax1.set_title(f"厚度分布直方图 (组距={bin_size:.3f}nm)")
-            ax1.set_xlabel("厚度 (nm)")
-            ax1.set_ylabel("频率密度")
-            ax1.grid(True, linestyle='--', alpha=0.3)
-            
-            # 创建正态分布拟合
-            ax3 = self.figure.add_subplot(212)
-            
-            # 生成正态分布曲线
-            x_min = mu - 4 * sigma
-            x_max = mu + 4 * sigma
-            if x_min < min_val:
-                x_min = min_val
-            if x_max > max_val:
-                x_max = max_val
-                
-            x = np.linspace(x_min, x_max, 300)
-            pdf = norm.pdf(x, mu, sigma)
-            
-            ax3.plot(x, pdf, 'r-', linewidth=2)
-            ax3.fill_between(x, pdf, 0, alpha=0.3, color='red')
-            
-            # 添加实测数据密度分布
+        if not self._stats_ready:
+            self._compute_stats()
+        
+        if not (np.isfinite(self._min) and np.isfinite(self._max)):
+            self.show_error("厚度数据包含无效值 (NaN/Inf)，无法生成分布统计")
+            return
+        
+        # 首次绘制或显示过错误信息后重建坐标轴
+        if self.ax1 is None:
+            self._init_axes()
+            self._draw_fit()
+            self.current_bin_size = None  # 新坐标轴上尚未绘制直方图
+            self._applied_bin_text = None
+        
+        thickness = self.thickness_data
+        min_val = self._min
+        max_val = self._max
+        
+        # 获取或计算组距
+        bin_text = self.bin_size_entry.text().strip()
+        if bin_text:
             try:
-                from scipy.stats import gaussian_kde
-                kde = gaussian_kde(thickness)
-                ax3.plot(x, kde(x), 'b--', linewidth=1.5, label="实测分布")
-            except Exception as e:
-                print(f"无法计算KDE: {str(e)}")
-            
-            # 设置正态图属性
-            ax3.set_title("正态分布拟合曲线")
-            ax3.set_xlabel("厚度 (nm)")
-            ax3.set_ylabel("概率密度")
-            ax3.grid(True, linestyle='--', alpha=0.3)
-            ax3.legend()
-            
-            # 添加统计信息文字
-            stats_text = (
-                f"数据点数: {len(thickness)}\n"
-                f"平均值 (μ): {mu:.3f} nm\n"
-                f"标准差 (σ): {sigma:.3f} nm\n"
-                f"最小值: {min_val:.3f} nm\n"
-                f"最大值: {max_val:.3f} nm"
-            )
-            ax3.text(
-                0.98, 0.65, stats_text,
-                transform=ax3.transAxes,
-                verticalalignment='top',
-                horizontalalignment='right',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
-                fontsize=10
-            )
-            
+                bin_size = float(bin_text)
+                if not np.isfinite(bin_size) or bin_size <= 0:
+                    raise ValueError
+            except ValueError:
+                bin_size = None
+        else:
+            bin_size = None
+        
+        # 组距输入与当前图表使用的文本相同（如重复点击更新按钮）时无需重绘；
+        # 自动组距回填的是保留3位小数的文本，因此按文本比较而不是与未取整的组距比较
+        if bin_size is not None and bin_text == self._applied_bin_text:
+            return
+        
+        if bin_size is None:
+            # 自动计算组数 (Freedman-Diaconis规则，使用缓存的四分位数)，最多20组
+            iqr = self._q75 - self._q25
+            if iqr > 0:
+                fd_width = 2 * iqr / (len(thickness) ** (1/3))
+                n_bins = min(int(np.ceil((max_val - min_val) / fd_width)), 20)
+            else:
+                n_bins = 10
+            bins = np.histogram_bin_edges(thickness, bins=max(n_bins, 1), range=(min_val, max_val))
+            bin_size = bins[1] - bins[0]
+            # 回填自动组距时不触发输入更新
+            self.bin_size_entry.blockSignals(True)
+            bin_text = f"{bin_size:.3f}"
+            self.bin_size_entry.setText(bin_text)
+            self.bin_size_entry.blockSignals(False)
+        else:
+            # 由端点直接生成等距边界，避免 arange 累加误差导致末端多出或缺少一组
+            n_bins = max(1, int(np.ceil((max_val - min_val) / bin_size)))
+            if n_bins > self.MAX_BINS:
+                self.show_error(f"组距过小：将生成 {n_bins} 组，最多允许 {self.MAX_BINS} 组")
+                return
+            bins = np.linspace(min_val, min_val + n_bins * bin_size, n_bins + 1)
+        
+        # 直方图是唯一需要重建的图元：用 np.histogram 统计后一次绘制全部柱形
+        ax1 = self.ax1
+        if self._hist_bars is not None:
+            self._hist_bars.remove()
+        n, bins = np.histogram(thickness, bins=bins, density=True)
+        self._hist_bars = ax1.bar(
+            bins[:-1], n, width=np.diff(bins), align='edge',
+            color='C0', edgecolor='black', alpha=0.7
+        )
+        ax1.set_xlim(bins[0], bins[-1])
+        ax1.set_ylim(0, n.max() * 1.05)
+        ax1.set_title(f"厚度分布直方图 (组距={bin_size:.3f}nm)")
+        
+        # 计算累积分布（原地乘以组距，不再分配第二个数组）
+        cumulative = np.cumsum(n)
+        cumulative *= bin_size
+        
+        # 更新累积分布曲线
+        self._cum_line.set_data(bins[:-1], cumulative)
+        
+        # 边距只在新坐标轴首次绘制时计算：组距更新只改变柱形、标题和刻度，
+        # 它们的尺寸变化很小，不值得每次重新求解布局
+        if self.current_bin_size is None:
             self.figure.tight_layout()
-            self.canvas.draw()
-            self.current_bin_size = bin_size
-            
-        except Exception as e:
-            self.show_error(f"图表生成错误: {str(e)}")
+        self.canvas.draw_idle()
+        self.current_bin_size = bin_size
+        self._applied_bin_text = bin_text
     
     def update_histogram(self):
         """更新直方图"""
+        self._debounce.stop()
+        self.draw_distribution_stats()
+    
+    def _apply_typed_bin_size(self):
+        """输入停顿后更新图表（输入不完整或无效时保持当前图表，由"更新图表"按钮处理）"""
+        try:
+            bin_size = float(self.bin_size_entry.text().strip())
+            if not np.isfinite(bin_size) or bin_size <= 0:
+                return
+        except ValueError:
+            return
         self.draw_distribution_stats()
     
     def show_error(self, message):
         """显示错误消息"""
         self.figure.clear()
+        self.ax1 = None  # 下次绘图时重建坐标轴
         ax = self.figure.add_subplot(111)
         ax.text(0.5, 0.5, message, 
                 horizontalalignment='center', verticalalignment='center',
@@ -10,41 +10,190 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib as mpl
 mpl.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
-from core.etching_processor import IonBeamProcessor
-from core.outlier_processor import OutlierProcessor
 from PyQt5.QtCore import QThread, pyqtSignal
-import pandas as pd
 from ui.dialogs import AdvancedOptionsDialog
 from core.config_manager import get_config_manager
-from core.simulation_logger import SimulationLogger
 
 class EtchingSimulationUI(QWidget):
     """刻蚀模拟和停留时间计算界面"""
+    # 统计标签样式（设置在各统计分组上只解析一次，标签通过动态属性匹配规则）
+    # statCell: 膜厚统计表格单元（默认为普通文字）；statBadge: 模拟过程/Recipe统计数值
+    # statCell 的 statVariant: good 为绿色文字（目标膜厚），pass/fail 为带底色边框的均一性结果；
+    # statBadge 的 statVariant: warn/alert/error 为背景色
+    _STATS_QSS = """
+            QLabel[statCell="true"][statVariant="good"] {
+                color: #006400;
+            }
+            QLabel[statCell="true"][statVariant="pass"],
+            QLabel[statCell="true"][statVariant="fail"] {
+                font-weight: bold;
+                background-color: #f8f8f8;
+                border: 1px solid #e0e0e0;
+            }
+            QLabel[statCell="true"][statVariant="pass"] {
+                color: #006400;
+            }
+            QLabel[statCell="true"][statVariant="fail"] {
+                color: #8b0000;
+            }
+            QLabel[statBadge="true"] {
+                font-weight: bold;
+                background-color: #e8f5e8;
+                border: 1px solid #c3e6c3;
+                border-radius: 3px;
+                padding: 2px 8px;
+            }
+            QLabel[statBadge="true"][statVariant="warn"] {
+                background-color: #fff3cd;
+                border: 1px solid #ffeaa7;
+            }
+            QLabel[statBadge="true"][statVariant="alert"] {
+                background-color: #f8d7da;
+                border: 1px solid #f5c6cb;
+            }
+            QLabel[statBadge="true"][statVariant="error"] {
+                background-color: #f8d7da;
+                border: 1px solid #f5c6cb;
+                color: #721c24;
+            }
+        """
+
+    # 左侧面板按钮与文件标签样式（设置在面板上只解析一次，按对象名/动态属性匹配）
+    _PANEL_QSS = """
+            QPushButton#advancedBtn {
+                background-color: #ff9800;
+                color: white;
+                font-weight: bold;
+                border-radius: 4px;
+                padding: 6px;
+            }
+            QPushButton#advancedBtn:hover {
+                background-color: #f57c00;
+            }
+            QPushButton#advancedBtn:pressed {
+                background-color: #e65100;
+            }
+            QPushButton#processBtn {
+                background-color: #4caf50;
+                color: white;
+                font-weight: bold;
+                font-size: 14px;
+                border-radius: 4px;
+                padding: 8px;
+            }
+            QPushButton#processBtn:hover {
+                background-color: #66bb6a;
+            }
+            QPushButton#processBtn:pressed {
+                background-color: #388e3c;
+            }
+            QPushButton#processBtn:disabled {
+                background-color: #a5d6a7;
+            }
+            QPushButton#stageSpeedBtn {
+                background-color: #1e88e5;
+                color: white;
+                font-weight: bold;
+                font-size: 14px;
+                border-radius: 4px;
+                padding: 8px;
+            }
+            QPushButton#stageSpeedBtn:hover {
+                background-color: #42a5f5;
+            }
+            QPushButton#stageSpeedBtn:pressed {
+                background-color: #0d47a1;
+            }
+            QPushButton#stageSpeedBtn:disabled {
+                background-color: #90caf9;
+            }
+            QPushButton#batchBtn {
+                background-color: #9c27b0;
+                color: white;
+                font-weight: bold;
+                font-size: 12px;
+                border-radius: 4px;
+                padding: 8px;
+            }
+            QPushButton#batchBtn:hover {
+                background-color: #ab47bc;
+            }
+            QPushButton#batchBtn:pressed {
+                background-color: #6a1b9a;
+            }
+            QPushButton#batchBtn:disabled {
+                background-color: #ce93d8;
+            }
+            QPushButton#selectFileBtn {
+                padding: 3px;
+            }
+            QLabel[fileLabel="true"] {
+                color: #555555;
+                background-color: #f0f0f0;
+                border-radius: 3px;
+                padding: 3px;
+            }
+            QLabel[fileLabel="true"][fileSelected="true"] {
+                color: #1e88e5;
+                font-weight: bold;
+                background-color: #e1f5fe;
+            }
+        """
+    # 目标膜厚一列的统计标签键
+    _TARGET_STAT_KEYS = ('min_target', 'max_target', 'mean_target', 'range_target', 'uniformity_target')
+    # 选择新的初始膜厚文件时重置的统计标签键（刻蚀后膜厚与刻蚀量两列）
+    _RESETTABLE_STAT_KEYS = ('min_result', 'max_result', 'mean_result', 'range_result', 'uniformity_result',
+                             'min_etch', 'max_etch', 'mean_etch', 'range_etch', 'uniformity_etch')
+    # 左右分隔条把手样式
+    _SPLITTER_QSS = """
+            QSplitter::handle:horizontal {
+                background: #d0d0d0;
+                border: 1px solid #b0b0b0;
+            }
+            QSplitter::handle:hover {
+                background: #90c0ff;
+            }
+        """
+    # 图表显示副本的精度（仅用于栅格化，计算数据仍为 float64）
+    _DISPLAY_DTYPE = np.float32
+    # 常用尺寸策略（QSizePolicy 为值类型，setSizePolicy 时复制，可在各控件间共享）
+    _EXPANDING_POLICY = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+    _H_EXPANDING_POLICY = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
         self.etching_file = None
+        self._etching_names_cache = None  # (路径, 文件名, 不含扩展名的文件名)，见 _etching_file_names
         self.beam_file = None
         self.output_dir = None
-        self.processor = IonBeamProcessor()
+        # 计算模块（处理器、异常值处理、日志、Recipe分析及 pandas）在首次使用时才导入，
+        # 界面创建时不加载
+        self.processor = None
+        self._file_dialog = None  # 文件/目录选择对话框，首次使用时创建并在各选择按钮间复用
         self.stat_labels = {}  
+        self._label_texts = {}  # 统计标签上次设置的文字，未变化时跳过 setText
         # 跟踪每个坐标轴的colorbar对象
         self.colorbars = {}
+        # 是否已登记待执行的图表刷新（见 schedule_plot_update）
+        self._plot_update_pending = False
+        # 绘图用晶圆掩模缓存: (X, Y, wafer_radius, mask)，网格和半径不变时各图表复用
+        self._wafer_mask_cache = None
 
-        # 从配置管理器加载高级选项参数
-        config_manager = get_config_manager()
-        self.transition_width = config_manager.get_transition_width()
-        self.recipe_range = config_manager.get_recipe_range()
-        self.uniformity_threshold = config_manager.get_uniformity_threshold()
-        self.speed_threshold = config_manager.get_speed_threshold()
+        # 从配置管理器加载高级选项参数（管理器引用保存下来，界面各处复用）
+        self.config_manager = get_config_manager()
+        self.transition_width = self.config_manager.get_transition_width()
+        self.recipe_range = self.config_manager.get_recipe_range()
+        self.uniformity_threshold = self.config_manager.get_uniformity_threshold()
+        self.speed_threshold = self.config_manager.get_speed_threshold()
 
-        # 初始化异常值处理器
-        self.outlier_processor = OutlierProcessor(self, self.main_window, self.uniformity_threshold)
+        # 异常值处理器在首次模拟时创建（见 _ensure_outlier_processor）
+        self.outlier_processor = None
 
         # 模拟过程统计变量
         self.simulation_count = 1  # 模拟次数，初始为1
@@ -63,6 +212,8 @@ class EtchingSimulationUI(QWidget):
     
     def init_ui(self):
         """初始化用户界面 - 使用左右分栏布局"""
+        # 构建期间暂停重绘，大量 setSizePolicy/addWidget 引起的布局失效合并为结束时的一次
+        self.setUpdatesEnabled(False)
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(5, 5, 5, 5)
         main_layout.setSpacing(0)
@@ -71,18 +222,11 @@ class EtchingSimulationUI(QWidget):
         self.splitter = QSplitter(Qt.Horizontal)
         self.splitter.setChildrenCollapsible(False)
         self.splitter.setHandleWidth(8)
-        self.splitter.setStyleSheet("""
-            QSplitter::handle:horizontal {
-                background: #d0d0d0;
-                border: 1px solid #b0b0b0;
-            }
-            QSplitter::handle:hover {
-                background: #90c0ff;
-            }
-        """)
+        self.splitter.setStyleSheet(self._SPLITTER_QSS)
         
         # === 左侧控制面板 ===
         left_panel = QWidget()
+        left_panel.setStyleSheet(self._PANEL_QSS)
         left_layout = QVBoxLayout(left_panel)
         left_layout.setContentsMargins(8, 8, 8, 8)
         left_layout.setSpacing(10)
@@ -98,21 +242,21 @@ class EtchingSimulationUI(QWidget):
         self.grid_size_combo = QComboBox()
         self.grid_size_combo.addItems(["150", "160", "170","180", "200","240","300"])
         self.grid_size_combo.setCurrentIndex(5)  # 默认240
-        self.grid_size_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.grid_size_combo.setSizePolicy(self._H_EXPANDING_POLICY)
         param_layout.addWidget(self.grid_size_combo, 0, 1, 1, 2)
         
         param_layout.addWidget(QLabel("分辨率 (mm/pixel):"), 1, 0)
         self.resolution_combo = QComboBox()
         self.resolution_combo.addItems(["0.5", "1.0", "2.0"])
         self.resolution_combo.setCurrentIndex(1)  # 默认1.0
-        self.resolution_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.resolution_combo.setSizePolicy(self._H_EXPANDING_POLICY)
         param_layout.addWidget(self.resolution_combo, 1, 1, 1, 2)
         
         param_layout.addWidget(QLabel("晶圆直径 (mm):"), 2, 0)
         self.wafer_diameter_combo = QComboBox()
         self.wafer_diameter_combo.addItems(["100", "150", "200"])
         self.wafer_diameter_combo.setCurrentIndex(1)  # 默认150
-        self.wafer_diameter_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.wafer_diameter_combo.setSizePolicy(self._H_EXPANDING_POLICY)
         param_layout.addWidget(self.wafer_diameter_combo, 2, 1, 1, 2)
         
         param_layout.addWidget(QLabel("目标膜厚 (nm):"), 3, 0)
@@ -120,55 +264,44 @@ class EtchingSimulationUI(QWidget):
         self.target_thickness_input.setRange(10, 10000)
         self.target_thickness_input.setValue(1800)
         self.target_thickness_input.setSingleStep(10)
-        self.target_thickness_input.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.target_thickness_input.setSizePolicy(self._H_EXPANDING_POLICY)
         param_layout.addWidget(self.target_thickness_input, 3, 1, 1, 2)
 
         # 新增载台中心点输入 - 从配置文件加载初始值
-        config_manager = get_config_manager()
-
         param_layout.addWidget(QLabel("载台中心X (mm):"), 4, 0)
         self.stage_center_x = QDoubleSpinBox()
         self.stage_center_x.setRange(-100, 100)
-        self.stage_center_x.setValue(config_manager.get_stage_center_x())
+        self.stage_center_x.setValue(self.config_manager.get_stage_center_x())
         self.stage_center_x.setSingleStep(1.0)
         param_layout.addWidget(self.stage_center_x, 4, 1, 1, 2)
 
         param_layout.addWidget(QLabel("载台中心Y (mm):"), 5, 0)
         self.stage_center_y = QDoubleSpinBox()
         self.stage_center_y.setRange(-200, 200)
-        self.stage_center_y.setValue(config_manager.get_stage_center_y())
+        self.stage_center_y.setValue(self.config_manager.get_stage_center_y())
         self.stage_center_y.setSingleStep(1.0)
         param_layout.addWidget(self.stage_center_y, 5, 1, 1, 2)
 
         # 添加信号连接：当载台中心坐标改变时自动保存到配置文件
-        self.stage_center_x.valueChanged.connect(self._save_stage_center_config)
-        self.stage_center_y.valueChanged.connect(self._save_stage_center_config)
+        # （按住微调按钮时连续变化，停顿 300ms 后才写一次文件）
+        self._stage_center_save_timer = QTimer(self)
+        self._stage_center_save_timer.setSingleShot(True)
+        self._stage_center_save_timer.setInterval(300)
+        self._stage_center_save_timer.timeout.connect(self._save_stage_center_config)
+        self.stage_center_x.valueChanged.connect(lambda _: self._stage_center_save_timer.start())
+        self.stage_center_y.valueChanged.connect(lambda _: self._stage_center_save_timer.start())
 
         # 新增: y-Step步长选择
         param_layout.addWidget(QLabel("y-Step步长:"), 6, 0)  # 新行，在第6行
         self.y_step_combo = QComboBox()
         self.y_step_combo.addItems(["1", "2", "3"])
         self.y_step_combo.setCurrentIndex(1)  # 默认2
-        self.y_step_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.y_step_combo.setSizePolicy(self._H_EXPANDING_POLICY)
         param_layout.addWidget(self.y_step_combo, 6, 1, 1, 2)
 
         # 高级选项按钮
         self.advanced_btn = QPushButton("高级选项")
-        self.advanced_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff9800;
-                color: white;
-                font-weight: bold;
-                border-radius: 4px;
-                padding: 6px;
-            }
-            QPushButton:hover {
-                background-color: #f57c00;
-            }
-            QPushButton:pressed {
-                background-color: #e65100;
-            }
-        """)
+        self.advanced_btn.setObjectName("advancedBtn")
         self.advanced_btn.clicked.connect(self.show_advanced_options)
         param_layout.addWidget(self.advanced_btn, 7, 0, 1, 3)
 
@@ -186,21 +319,14 @@ class EtchingSimulationUI(QWidget):
         
         sub_layout = QHBoxLayout()
         self.etching_label = QLabel("未选择")
+        self.etching_label.setProperty('fileLabel', True)
         self.etching_label.setWordWrap(True)  # 启用自动换行
-        self.etching_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.etching_label.setStyleSheet("""
-            QLabel {
-                color: #555555; 
-                background-color: #f0f0f0;
-                border-radius: 3px;
-                padding: 3px;
-            }
-        """)
+        self.etching_label.setSizePolicy(self._H_EXPANDING_POLICY)
         sub_layout.addWidget(self.etching_label)
         
         self.select_etching_btn = QPushButton("选择...")
         self.select_etching_btn.setFixedWidth(80)
-        self.select_etching_btn.setStyleSheet("padding: 3px;")
+        self.select_etching_btn.setObjectName("selectFileBtn")
         self.select_etching_btn.clicked.connect(self.select_etching_data)
         sub_layout.addWidget(self.select_etching_btn)
         
@@ -213,21 +339,14 @@ class EtchingSimulationUI(QWidget):
         
         sub_layout = QHBoxLayout()
         self.beam_label = QLabel("未选择")
+        self.beam_label.setProperty('fileLabel', True)
         self.beam_label.setWordWrap(True)  # 启用自动换行
-        self.beam_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.beam_label.setStyleSheet("""
-            QLabel {
-                color: #555555; 
-                background-color: #f0f0f0;
-                border-radius: 3px;
-                padding: 3px;
-            }
-        """)
+        self.beam_label.setSizePolicy(self._H_EXPANDING_POLICY)
         sub_layout.addWidget(self.beam_label)
         
         self.select_beam_btn = QPushButton("选择...")
         self.select_beam_btn.setFixedWidth(80)
-        self.select_beam_btn.setStyleSheet("padding: 3px;")
+        self.select_beam_btn.setObjectName("selectFileBtn")
         self.select_beam_btn.clicked.connect(self.select_beam_profile)
         sub_layout.addWidget(self.select_beam_btn)
         
@@ -240,21 +359,14 @@ class EtchingSimulationUI(QWidget):
         
         sub_layout = QHBoxLayout()
         self.output_label = QLabel("未选择")
+        self.output_label.setProperty('fileLabel', True)
         self.output_label.setWordWrap(True)  # 启用自动换行
-        self.output_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.output_label.setStyleSheet("""
-            QLabel {
-                color: #555555; 
-                background-color: #f0f0f0;
-                border-radius: 3px;
-                padding: 3px;
-            }
-        """)
+        self.output_label.setSizePolicy(self._H_EXPANDING_POLICY)
         sub_layout.addWidget(self.output_label)
         
         self.select_output_btn = QPushButton("选择...")
         self.select_output_btn.setFixedWidth(80)
-        self.select_output_btn.setStyleSheet("padding: 3px;")
+        self.select_output_btn.setObjectName("selectFileBtn")
         self.select_output_btn.clicked.connect(self.select_output_dir)
         sub_layout.addWidget(self.select_output_btn)
         
@@ -266,6 +378,7 @@ class EtchingSimulationUI(QWidget):
         # === 统计数据区域 ===
         stats_group = QGroupBox("膜厚统计")
         stats_group.setFont(QFont("Arial", 10, QFont.Bold))
+        stats_group.setStyleSheet(self._STATS_QSS)
         stats_layout = QGridLayout(stats_group)
         stats_layout.setHorizontalSpacing(10)
         stats_layout.setVerticalSpacing(6)
@@ -330,25 +443,14 @@ class EtchingSimulationUI(QWidget):
         # 设置标签样式
         for label in self.stat_labels.values():
             label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet("""
-                font-weight: bold; 
-                background-color: #f8f8f8;
-                border: 1px solid #e0e0e0;
-                border-radius: 3px;
-                padding: 2px;
-            """)
-            
-        for row in range(1, 6):
-            for col in range(1, 5):
-                item = stats_layout.itemAtPosition(row, col)
-                if item and item.widget():
-                    item.widget().setStyleSheet("text-align: center;")
+            label.setProperty('statCell', True)
         
         left_layout.addWidget(stats_group, 1)
 
         # === 模拟过程统计区域 ===
         process_stats_group = QGroupBox("模拟过程统计")
         process_stats_group.setFont(QFont("Arial", 10, QFont.Bold))
+        process_stats_group.setStyleSheet(self._STATS_QSS)
         process_stats_layout = QGridLayout(process_stats_group)
         process_stats_layout.setHorizontalSpacing(10)
         process_stats_layout.setVerticalSpacing(6)  # 与刻蚀模拟参数保持一致的行间距
@@ -360,39 +462,23 @@ class EtchingSimulationUI(QWidget):
         process_stats_layout.addWidget(QLabel("模拟次数:"), 0, 0)
         self.process_stat_labels['simulation_count'] = QLabel("1")
         self.process_stat_labels['simulation_count'].setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.process_stat_labels['simulation_count'].setStyleSheet("""
-            font-weight: bold;
-            background-color: #e8f5e8;
-            border: 1px solid #c3e6c3;
-            border-radius: 3px;
-            padding: 2px 8px;
-        """)
+        self.process_stat_labels['simulation_count'].setProperty('statBadge', True)
         process_stats_layout.addWidget(self.process_stat_labels['simulation_count'], 0, 1)
 
         # 异常值剔除次数
         process_stats_layout.addWidget(QLabel("异常值剔除次数:"), 1, 0)
         self.process_stat_labels['outlier_removal_count'] = QLabel("0")
         self.process_stat_labels['outlier_removal_count'].setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.process_stat_labels['outlier_removal_count'].setStyleSheet("""
-            font-weight: bold;
-            background-color: #fff3cd;
-            border: 1px solid #ffeaa7;
-            border-radius: 3px;
-            padding: 2px 8px;
-        """)
+        self.process_stat_labels['outlier_removal_count'].setProperty('statBadge', True)
+        self.process_stat_labels['outlier_removal_count'].setProperty('statVariant', 'warn')
         process_stats_layout.addWidget(self.process_stat_labels['outlier_removal_count'], 1, 1)
 
         # 已剔除异常点个数
         process_stats_layout.addWidget(QLabel("已剔除异常点个数:"), 2, 0)
         self.process_stat_labels['total_removed_points'] = QLabel("0")
         self.process_stat_labels['total_removed_points'].setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.process_stat_labels['total_removed_points'].setStyleSheet("""
-            font-weight: bold;
-            background-color: #f8d7da;
-            border: 1px solid #f5c6cb;
-            border-radius: 3px;
-            padding: 2px 8px;
-        """)
+        self.process_stat_labels['total_removed_points'].setProperty('statBadge', True)
+        self.process_stat_labels['total_removed_points'].setProperty('statVariant', 'alert')
         process_stats_layout.addWidget(self.process_stat_labels['total_removed_points'], 2, 1)
 
         left_layout.addWidget(process_stats_group, 1)
@@ -403,50 +489,14 @@ class EtchingSimulationUI(QWidget):
         btn_layout.addSpacing(10)
         
         self.process_btn = QPushButton("开始模拟")
+        self.process_btn.setObjectName("processBtn")
         self.process_btn.setMinimumHeight(42)
-        self.process_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4caf50;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 4px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #66bb6a;
-            }
-            QPushButton:pressed {
-                background-color: #388e3c;
-            }
-            QPushButton:disabled {
-                background-color: #a5d6a7;
-            }
-        """)
         self.process_btn.clicked.connect(self.run_simulation)
 
         # 新增生成载台运动速度按钮
         self.generate_stage_speed_btn = QPushButton("生成载台运动速度Recipe")
+        self.generate_stage_speed_btn.setObjectName("stageSpeedBtn")
         self.generate_stage_speed_btn.setMinimumHeight(42)
-        self.generate_stage_speed_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #1e88e5;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 4px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #42a5f5;
-            }
-            QPushButton:pressed {
-                background-color: #0d47a1;
-            }
-            QPushButton:disabled {
-                background-color: #90caf9;
-            }
-        """)
         self.generate_stage_speed_btn.clicked.connect(self.generate_stage_speed_map)
 
         # 添加响应式布局
@@ -456,6 +506,7 @@ class EtchingSimulationUI(QWidget):
         # === 运动速度Recipe统计 ===
         recipe_stats_group = QGroupBox("运动速度Recipe统计")
         recipe_stats_group.setFont(QFont("Arial", 10, QFont.Bold))
+        recipe_stats_group.setStyleSheet(self._STATS_QSS)
         recipe_stats_layout = QGridLayout(recipe_stats_group)
         recipe_stats_layout.setHorizontalSpacing(10)
         recipe_stats_layout.setVerticalSpacing(6)  # 与模拟过程统计保持一致的行间距
@@ -464,13 +515,7 @@ class EtchingSimulationUI(QWidget):
         recipe_rows_label = QLabel("Recipe行数:")
         self.recipe_rows_value = QLabel("--")
         self.recipe_rows_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.recipe_rows_value.setStyleSheet("""
-            font-weight: bold;
-            background-color: #e8f5e8;
-            border: 1px solid #c3e6c3;
-            border-radius: 3px;
-            padding: 2px 8px;
-        """)
+        self.recipe_rows_value.setProperty('statBadge', True)
         recipe_stats_layout.addWidget(recipe_rows_label, 0, 0)
         recipe_stats_layout.addWidget(self.recipe_rows_value, 0, 1)
 
@@ -478,22 +523,14 @@ class EtchingSimulationUI(QWidget):
         etch_time_label = QLabel("刻蚀时间:")
         self.etch_time_value = QLabel("--")
         self.etch_time_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.etch_time_value.setStyleSheet("""
-            font-weight: bold;
-            background-color: #fff3cd;
-            border: 1px solid #ffeaa7;
-            border-radius: 3px;
-            padding: 2px 8px;
-        """)
+        self.etch_time_value.setProperty('statBadge', True)
+        self.etch_time_value.setProperty('statVariant', 'warn')
         recipe_stats_layout.addWidget(etch_time_label, 1, 0)
         recipe_stats_layout.addWidget(self.etch_time_value, 1, 1)
 
-        # 初始化Recipe分析器
-        from core.recipe_analyzer import RecipeAnalyzer
-        self.recipe_analyzer = RecipeAnalyzer()
-
-        # 初始化模拟日志记录器
-        self.simulation_logger = SimulationLogger()
+        # Recipe分析器和模拟日志记录器在首次使用时创建
+        self.recipe_analyzer = None
+        self.simulation_logger = None
 
         recipe_stats_group.setLayout(recipe_stats_layout)
         btn_layout.addWidget(recipe_stats_group)
@@ -503,26 +540,8 @@ class EtchingSimulationUI(QWidget):
 
         # 添加批量处理按钮
         self.batch_process_btn = QPushButton("以当前设置参数及Beam强度进行批量处理")
+        self.batch_process_btn.setObjectName("batchBtn")
         self.batch_process_btn.setMinimumHeight(42)
-        self.batch_process_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #9c27b0;
-                color: white;
-                font-weight: bold;
-                font-size: 12px;
-                border-radius: 4px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #ab47bc;
-            }
-            QPushButton:pressed {
-                background-color: #6a1b9a;
-            }
-            QPushButton:disabled {
-                background-color: #ce93d8;
-            }
-        """)
         self.batch_process_btn.clicked.connect(self.start_batch_processing)
         btn_layout.addWidget(self.batch_process_btn)
         btn_layout.addSpacing(15)
@@ -535,7 +554,7 @@ class EtchingSimulationUI(QWidget):
         
         # === 右侧可视化区域 (可滚动) ===
         self.visualization_container = QWidget()
-        self.visualization_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.visualization_container.setSizePolicy(self._EXPANDING_POLICY)
         
         # 创建主布局
         main_visual_layout = QVBoxLayout(self.visualization_container)
@@ -553,73 +572,20 @@ class EtchingSimulationUI(QWidget):
         thickness_layout.setSpacing(8)
         thickness_layout.setContentsMargins(5, 5, 5, 5)
         
-        # 创建4个图表容器
-        self.canvas_containers_thickness = []
-        for i in range(4):
-            container = QWidget()
-            container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(2, 2, 2, 2)
-            container_layout.setSpacing(0)
-            self.canvas_containers_thickness.append(container)
-
-            # 创建画布并添加到容器
-            canvas = FigureCanvas(Figure())
-            canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            container_layout.addWidget(canvas)
-
-            # 添加到布局 - 2x2网格布局
-            thickness_layout.addWidget(container, i // 2, i % 2)
-        
-        # 为每个画布创建引用
-        self.canvas_initial = self.canvas_containers_thickness[0].layout().itemAt(0).widget()
-        self.canvas_etching_depth = self.canvas_containers_thickness[1].layout().itemAt(0).widget()
-        self.canvas_result = self.canvas_containers_thickness[2].layout().itemAt(0).widget()
-        self.canvas_etch_amount = self.canvas_containers_thickness[3].layout().itemAt(0).widget()
-
-        # 设置背景色
-        for canvas in [self.canvas_initial, self.canvas_etching_depth, self.canvas_result, self.canvas_etch_amount]:
-            canvas.figure.set_facecolor('#f9f9f9')
+        # 创建4个图表 - 2x2网格布局
+        self.canvas_initial = self._make_canvas_cell(thickness_layout, 0, 0)
+        self.canvas_etching_depth = self._make_canvas_cell(thickness_layout, 0, 1)
+        self.canvas_result = self._make_canvas_cell(thickness_layout, 1, 0)
+        self.canvas_etch_amount = self._make_canvas_cell(thickness_layout, 1, 1)
         
         self.tab_widget.addTab(thickness_tab, "膜厚分布")
         
         # === 选项卡2: 束流与运动 ===
-        beam_motion_tab = QWidget()
-        beam_motion_layout = QGridLayout(beam_motion_tab)
-        beam_motion_layout.setSpacing(8)
-        beam_motion_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # 创建3个图表容器
-        self.canvas_containers_beam_motion = []
-        for i in range(3):
-            container = QWidget()
-            container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(2, 2, 2, 2)
-            container_layout.setSpacing(0)
-            self.canvas_containers_beam_motion.append(container)
-            
-            # 创建画布并添加到容器
-            canvas = FigureCanvas(Figure())
-            canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            container_layout.addWidget(canvas)
-            
-            # 添加到布局
-            if i < 2:
-                beam_motion_layout.addWidget(container, 0, i)
-            else:
-                beam_motion_layout.addWidget(container, 1, 0, 1, 2)
-        
-        # 为每个画布创建引用
-        self.canvas_beam = self.canvas_containers_beam_motion[0].layout().itemAt(0).widget()
-        self.canvas_dwell = self.canvas_containers_beam_motion[1].layout().itemAt(0).widget()
-        self.canvas_velocity = self.canvas_containers_beam_motion[2].layout().itemAt(0).widget()
-        
-        # 设置背景色
-        for canvas in [self.canvas_beam, self.canvas_dwell, self.canvas_velocity]:
-            canvas.figure.set_facecolor('#f9f9f9')
-        
-        self.tab_widget.addTab(beam_motion_tab, "束流与运动")
+        # 该选项卡的画布在首次切换到该页时才创建（见 _ensure_beam_motion_built）
+        self.beam_motion_tab = QWidget()
+        self._beam_motion_built = False
+        self.tab_widget.addTab(self.beam_motion_tab, "束流与运动")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         # 初始图表
         self.init_plots()
@@ -632,9 +598,14 @@ class EtchingSimulationUI(QWidget):
         
         # 将分隔条添加到主布局
         main_layout.addWidget(self.splitter)
+
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
     
     def init_plots(self):
         """初始化所有图表区域"""
+        # 占位图只登记延迟重绘：画布在布局确定尺寸后首次显示时才栅格化，
+        # 未显示的选项卡不会在启动时渲染
         # === 膜厚分布选项卡 ===
         # 初始膜厚
         self.ax_initial = self.canvas_initial.figure.add_subplot(111)
@@ -644,7 +615,7 @@ class EtchingSimulationUI(QWidget):
                             transform=self.ax_initial.transAxes,
                             color='gray', alpha=0.5)
         self.ax_initial.set_axis_off()
-        self.canvas_initial.draw()
+        self.canvas_initial.draw_idle()
         
         # 刻蚀深度
         self.ax_etching_depth = self.canvas_etching_depth.figure.add_subplot(111)
@@ -654,7 +625,7 @@ class EtchingSimulationUI(QWidget):
                             transform=self.ax_etching_depth.transAxes,
                             color='gray', alpha=0.5)
         self.ax_etching_depth.set_axis_off()
-        self.canvas_etching_depth.draw()
+        self.canvas_etching_depth.draw_idle()
         
         # 刻蚀后膜厚
         self.ax_result = self.canvas_result.figure.add_subplot(111)
@@ -664,7 +635,7 @@ class EtchingSimulationUI(QWidget):
                             transform=self.ax_result.transAxes,
                             color='gray', alpha=0.5)
         self.ax_result.set_axis_off()
-        self.canvas_result.draw()
+        self.canvas_result.draw_idle()
 
         # 刻蚀量膜厚
         self.ax_etch_amount = self.canvas_etch_amount.figure.add_subplot(111)
@@ -674,9 +645,60 @@ class EtchingSimulationUI(QWidget):
                                  transform=self.ax_etch_amount.transAxes,
                                  color='gray', alpha=0.5)
         self.ax_etch_amount.set_axis_off()
-        self.canvas_etch_amount.draw()
-
-        # === 束流与运动选项卡 ===
+        self.canvas_etch_amount.draw_idle()
+        
+        # === 束流与运动选项卡（已创建时一并重置）===
+        if self._beam_motion_built:
+            self._init_beam_motion_plots()
+    
+    def _make_canvas_cell(self, grid, row, col, row_span=1, col_span=1):
+        """在网格布局中创建一个图表容器及画布，返回画布"""
+        container = QWidget()
+        container.setSizePolicy(self._EXPANDING_POLICY)
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(2, 2, 2, 2)
+        container_layout.setSpacing(0)
+
+        # 创建画布并添加到容器
+        canvas = FigureCanvas(Figure())
+        canvas.setSizePolicy(self._EXPANDING_POLICY)
+        canvas.figure.set_facecolor('#f9f9f9')  # 设置背景色
+        # 图表位置固定，创建时一次性设定边距，绘制时不再计算布局
+        canvas.figure.subplots_adjust(left=0.08, right=0.92, top=0.92, bottom=0.08)
+        container_layout.addWidget(canvas)
+
+        grid.addWidget(container, row, col, row_span, col_span)
+        return canvas
+    
+    def _on_tab_changed(self, index):
+        """切换选项卡时按需创建束流与运动图表"""
+        if self.tab_widget.widget(index) is self.beam_motion_tab:
+            self._ensure_beam_motion_built()
+    
+    def _ensure_beam_motion_built(self):
+        """创建束流与运动选项卡的画布和坐标轴（只在首次显示时执行一次）"""
+        if self._beam_motion_built:
+            return
+        self._beam_motion_built = True
+        
+        beam_motion_layout = QGridLayout(self.beam_motion_tab)
+        beam_motion_layout.setSpacing(8)
+        beam_motion_layout.setContentsMargins(5, 5, 5, 5)
+        
+        # 创建3个图表：上排两个，速度分布占满下排
+        self.canvas_beam = self._make_canvas_cell(beam_motion_layout, 0, 0)
+        self.canvas_dwell = self._make_canvas_cell(beam_motion_layout, 0, 1)
+        self.canvas_velocity = self._make_canvas_cell(beam_motion_layout, 1, 0, 1, 2)
+        self._init_beam_motion_plots()
+        
+        # 创建前已有模拟结果时直接显示
+        if hasattr(self.processor, 'dwell_time'):
+            self._update_beam_motion_plots()
+            for canvas in (self.canvas_beam, self.canvas_dwell, self.canvas_velocity):
+                canvas.draw_idle()
+    
+    def _init_beam_motion_plots(self):
+        """初始化束流与运动选项卡的图表区域"""
         # 离子束分布
         self.ax_beam = self.canvas_beam.figure.add_subplot(111)
         self.ax_beam.set_title("离子束分布", fontsize=10)
@@ -685,7 +707,7 @@ class EtchingSimulationUI(QWidget):
                          transform=self.ax_beam.transAxes,
                          color='gray', alpha=0.5)
         self.ax_beam.set_axis_off()
-        self.canvas_beam.draw()
+        self.canvas_beam.draw_idle()
         
         # 停留时间分布
         self.ax_dwell = self.canvas_dwell.figure.add_subplot(111)
@@ -695,7 +717,7 @@ class EtchingSimulationUI(QWidget):
                           transform=self.ax_dwell.transAxes,
                           color='gray', alpha=0.5)
         self.ax_dwell.set_axis_off()
-        self.canvas_dwell.draw()
+        self.canvas_dwell.draw_idle()
         
         # 速度分布
         self.ax_velocity = self.canvas_velocity.figure.add_subplot(111)
@@ -705,130 +727,166 @@ class EtchingSimulationUI(QWidget):
                              transform=self.ax_velocity.transAxes,
                              color='gray', alpha=0.5)
         self.ax_velocity.set_axis_off()
-        self.canvas_velocity.draw()
+        self.canvas_velocity.draw_idle()
     
     def update_stat_labels(self, initial_stats=None, target=None, validated_stats=None, etch_stats=None):
         """更新统计信息标签"""
-        # 初始膜厚
-        if initial_stats:
-            self.stat_labels['min_initial'].setText(f"{initial_stats['min']:.1f}")
-            self.stat_labels['max_initial'].setText(f"{initial_stats['max']:.1f}")
-            self.stat_labels['mean_initial'].setText(f"{initial_stats['mean']:.1f}")
-            self.stat_labels['range_initial'].setText(f"{initial_stats['range']:.1f}")
-            self.stat_labels['uniformity_initial'].setText(f"{initial_stats.get('uniformity', 0):.2f}%")
-        
-        # 目标膜厚
-        if target is not None:
-            self.stat_labels['min_target'].setText(f"{target:.1f}")
-            self.stat_labels['max_target'].setText(f"{target:.1f}")
-            self.stat_labels['mean_target'].setText(f"{target:.1f}")
-            self.stat_labels['range_target'].setText("0.0")
-            self.stat_labels['uniformity_target'].setText("0.00%")
+        # 批量更新期间暂停重绘，所有标签变化合并为一次重绘
+        self.setUpdatesEnabled(False)
+        try:
+            # 初始膜厚
+            if initial_stats:
+                self._set_label_text(self.stat_labels['min_initial'], f"{initial_stats['min']:.1f}")
+                self._set_label_text(self.stat_labels['max_initial'], f"{initial_stats['max']:.1f}")
+                self._set_label_text(self.stat_labels['mean_initial'], f"{initial_stats['mean']:.1f}")
+                self._set_label_text(self.stat_labels['range_initial'], f"{initial_stats['range']:.1f}")
+                self._set_label_text(self.stat_labels['uniformity_initial'], f"{initial_stats.get('uniformity', 0):.2f}%")
+        
+            # 目标膜厚
+            if target is not None:
+                self._set_label_text(self.stat_labels['min_target'], f"{target:.1f}")
+                self._set_label_text(self.stat_labels['max_target'], f"{target:.1f}")
+                self._set_label_text(self.stat_labels['mean_target'], f"{target:.1f}")
+                self._set_label_text(self.stat_labels['range_target'], "0.0")
+                self._set_label_text(self.stat_labels['uniformity_target'], "0.00%")
             
-            # 设置为绿色表示成功
-            for key, widget in self.stat_labels.items():
-                if 'target' in key:
-                    widget.setStyleSheet(widget.styleSheet() + 
-                                       "; color: #006400;")  # 深绿色
-        
-        # 刻蚀后膜厚
-        if validated_stats:
-            self.stat_labels['min_result'].setText(f"{validated_stats['min']:.1f}")
-            self.stat_labels['max_result'].setText(f"{validated_stats['max']:.1f}")
-            self.stat_labels['mean_result'].setText(f"{validated_stats['mean']:.1f}")
-            self.stat_labels['range_result'].setText(f"{validated_stats['range']:.1f}")
-            self.stat_labels['uniformity_result'].setText(f"{validated_stats.get('uniformity', 0):.2f}%")
+                # 设置为绿色表示成功
+                for key in self._TARGET_STAT_KEYS:
+                    self._set_stat_variant(self.stat_labels[key], 'good')  # 深绿色
+        
+            # 刻蚀后膜厚
+            if validated_stats:
+                self._set_label_text(self.stat_labels['min_result'], f"{validated_stats['min']:.1f}")
+                self._set_label_text(self.stat_labels['max_result'], f"{validated_stats['max']:.1f}")
+                self._set_label_text(self.stat_labels['mean_result'], f"{validated_stats['mean']:.1f}")
+                self._set_label_text(self.stat_labels['range_result'], f"{validated_stats['range']:.1f}")
+                self._set_label_text(self.stat_labels['uniformity_result'], f"{validated_stats.get('uniformity', 0):.2f}%")
             
-            # 根据均一性设置颜色
-            if 'uniformity' in validated_stats:
-                uniformity = validated_stats['uniformity']
-                color = "#8b0000" if uniformity > 1.0 else "#006400"  # 红色表示未达标
-                self.stat_labels['uniformity_result'].setStyleSheet(
-                    f"font-weight: bold; background-color: #f8f8f8; border: 1px solid #e0e0e0; color: {color};"
-                )
+                # 根据均一性设置颜色
+                if 'uniformity' in validated_stats:
+                    uniformity = validated_stats['uniformity']
+                    variant = 'fail' if uniformity > 1.0 else 'pass'  # 红色表示未达标
+                    self._set_stat_variant(self.stat_labels['uniformity_result'], variant)
+
+            # 刻蚀量统计
+            if etch_stats:
+                self._set_label_text(self.stat_labels['min_etch'], f"{etch_stats['min']:.1f}")
+                self._set_label_text(self.stat_labels['max_etch'], f"{etch_stats['max']:.1f}")
+                self._set_label_text(self.stat_labels['mean_etch'], f"{etch_stats['mean']:.1f}")
+                self._set_label_text(self.stat_labels['range_etch'], f"{etch_stats['range']:.1f}")
+                self._set_label_text(self.stat_labels['uniformity_etch'], f"{etch_stats.get('uniformity', 0):.2f}%")
+
+                # 根据刻蚀量均一性设置颜色
+                if 'uniformity' in etch_stats:
+                    uniformity = etch_stats['uniformity']
+                    variant = 'fail' if uniformity > 1.0 else 'pass'  # 红色表示未达标
+                    self._set_stat_variant(self.stat_labels['uniformity_etch'], variant)
+
+            # 初始化模拟过程统计显示
+            self.update_process_statistics()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _set_label_text(self, label, text):
+        """仅在文字变化时更新统计标签（避免无谓的布局失效和重绘）"""
+        if self._label_texts.get(label) == text:
+            return
+        self._label_texts[label] = text
+        label.setText(text)
 
-        # 刻蚀量统计
-        if etch_stats:
-            self.stat_labels['min_etch'].setText(f"{etch_stats['min']:.1f}")
-            self.stat_labels['max_etch'].setText(f"{etch_stats['max']:.1f}")
-            self.stat_labels['mean_etch'].setText(f"{etch_stats['mean']:.1f}")
-            self.stat_labels['range_etch'].setText(f"{etch_stats['range']:.1f}")
-            self.stat_labels['uniformity_etch'].setText(f"{etch_stats.get('uniformity', 0):.2f}%")
-
-            # 根据刻蚀量均一性设置颜色
-            if 'uniformity' in etch_stats:
-                uniformity = etch_stats['uniformity']
-                color = "#8b0000" if uniformity > 1.0 else "#006400"  # 红色表示未达标
-                self.stat_labels['uniformity_etch'].setStyleSheet(
-                    f"font-weight: bold; background-color: #f8f8f8; border: 1px solid #e0e0e0; color: {color};"
-                )
+    def _mark_file_selected(self, label):
+        """将文件标签切换为已选择样式（规则见 _PANEL_QSS）"""
+        if label.property('fileSelected'):
+            return
+        label.setProperty('fileSelected', True)
+        label.style().unpolish(label)
+        label.style().polish(label)
 
-        # 初始化模拟过程统计显示
-        self.update_process_statistics()
+    def _set_stat_variant(self, label, variant):
+        """切换统计标签的样式变体（规则见 _STATS_QSS，空字符串恢复默认样式）"""
+        if (label.property('statVariant') or '') == variant:
+            return
+        label.setProperty('statVariant', variant)
+        # 动态属性变化后需重新 polish 才会重新匹配样式规则
+        label.style().unpolish(label)
+        label.style().polish(label)
 
     def select_etching_data(self):
         """选择初始膜厚数据文件"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择初始膜厚数据文件", "", "CSV文件 (*.csv);;所有文件 (*.*)"
-        )
-        if file_path:
+        selected = self._exec_file_dialog("选择初始膜厚数据文件", QFileDialog.ExistingFile,
+                                          "CSV文件 (*.csv);;所有文件 (*.*)")
+        if selected:
+            file_path = selected[0]
             self.etching_file = file_path
-            self.etching_label.setText(os.path.basename(file_path))
-            self.etching_label.setStyleSheet("""
-                QLabel {
-                    color: #1e88e5; 
-                    font-weight: bold;
-                    background-color: #e1f5fe;
-                    border-radius: 3px;
-                    padding: 3px;
-                }
-            """)
+            self.etching_label.setText(self._etching_file_names()[0])
+            self._mark_file_selected(self.etching_label)
             
-            # 当新文件加载时，重置部分状态
-            for key in ['min_result', 'max_result', 'mean_result',
-                       'range_result', 'uniformity_result',
-                       'min_etch', 'max_etch', 'mean_etch',
-                       'range_etch', 'uniformity_etch']:
-                self.stat_labels[key].setText('--')
-                if 'uniformity' in key:
-                    self.stat_labels[key].setStyleSheet('')
+            # 当新文件加载时，重置部分状态（暂停重绘，合并为一次）
+            self.setUpdatesEnabled(False)
+            try:
+                for key in self._RESETTABLE_STAT_KEYS:
+                    self._set_label_text(self.stat_labels[key], '--')
+                self._set_stat_variant(self.stat_labels['uniformity_result'], '')
+                self._set_stat_variant(self.stat_labels['uniformity_etch'], '')
+            finally:
+                self.setUpdatesEnabled(True)
+    
+    def _etching_file_names(self):
+        """
+        返回当前初始膜厚文件的 (文件名, 不含扩展名的文件名)
+        
+        etching_file 未变化时复用上次拆分的结果；未选择文件时均为空字符串
+        """
+        path = self.etching_file
+        cache = self._etching_names_cache
+        if cache is None or cache[0] != path:
+            basename = os.path.basename(path) if path else ''
+            cache = (path, basename, os.path.splitext(basename)[0])
+            self._etching_names_cache = cache
+        return cache[1], cache[2]
     
     def select_beam_profile(self):
         """选择离子束轮廓文件"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择离子束轮廓文件", "", "CSV文件 (*.csv);;所有文件 (*.*)"
-        )
-        if file_path:
+        selected = self._exec_file_dialog("选择离子束轮廓文件", QFileDialog.ExistingFile,
+                                          "CSV文件 (*.csv);;所有文件 (*.*)")
+        if selected:
+            file_path = selected[0]
             self.beam_file = file_path
             self.beam_label.setText(os.path.basename(file_path))
-            self.beam_label.setStyleSheet("""
-                QLabel {
-                    color: #1e88e5; 
-                    font-weight: bold;
-                    background-color: #e1f5fe;
-                    border-radius: 3px;
-                    padding: 3px;
-                }
-            """)
+            self._mark_file_selected(self.beam_label)
     
     def select_output_dir(self):
         """选择输出目录"""
-        output_dir = QFileDialog.getExistingDirectory(
-            self, "选择输出目录", "", QFileDialog.ShowDirsOnly
-        )
-        if output_dir:
+        selected = self._exec_file_dialog("选择输出目录", QFileDialog.Directory)
+        if selected:
+            output_dir = selected[0]
             self.output_dir = output_dir
             self.output_label.setText(output_dir)
-            self.output_label.setStyleSheet("""
-                QLabel {
-                    color: #1e88e5; 
-                    font-weight: bold;
-                    background-color: #e1f5fe;
-                    border-radius: 3px;
-                    padding: 3px;
-                }
-            """)
+            self._mark_file_selected(self.output_label)
+    
+    def _exec_file_dialog(self, title, file_mode, name_filter=""):
+        """
+        以模态方式显示复用的文件选择对话框
+        
+        返回: 选中的路径列表，取消时为空列表
+        """
+        if self._file_dialog is None:
+            self._file_dialog = QFileDialog(self)
+        dialog = self._file_dialog
+        dialog.setWindowTitle(title)
+        dialog.setFileMode(file_mode)
+        dialog.setOption(QFileDialog.ShowDirsOnly, file_mode == QFileDialog.Directory)
+        dialog.setNameFilter(name_filter)
+        if dialog.exec_() == QFileDialog.Accepted:
+            return dialog.selectedFiles()
+        return []
     
+    def _ensure_outlier_processor(self):
+        """首次模拟前创建异常值处理器"""
+        if self.outlier_processor is None:
+            from core.outlier_processor import OutlierProcessor
+            self.outlier_processor = OutlierProcessor(self, self.main_window, self.uniformity_threshold)
+
     def run_simulation(self):
         """执行刻蚀模拟"""
         if not self.etching_file:
@@ -874,6 +932,8 @@ class EtchingSimulationUI(QWidget):
             wafer_diameter = float(self.wafer_diameter_combo.currentText())
             target_thickness = self.target_thickness_input.value()
             
+            from core.etching_processor import IonBeamProcessor
+            self._ensure_outlier_processor()
             self.processor = IonBeamProcessor(
                 grid_size=grid_size,
                 resolution=resolution,
@@ -911,15 +971,15 @@ class EtchingSimulationUI(QWidget):
             if results:
                 self.main_window.update_status_message("刻蚀模拟完成!")
                 # 更新图表面板
-                self.update_plots()
+                self.schedule_plot_update()
 
                 # 更新统计信息
                 initial_stats = results.get('initial_thickness_stats', {})
                 target_thickness = results.get('target_thickness', 0)
                 validated_stats = results.get('validated_thickness_stats', {})  # 修改: 使用验算统计
 
-                # 计算刻蚀量统计
-                etch_stats = self.processor.calculate_etch_amount_stats()
+                # 刻蚀量统计已在模拟线程中算好
+                etch_stats = self._etch_stats_from_results(results)
 
                 self.update_stat_labels(initial_stats, target_thickness, validated_stats, etch_stats)  # 修改
 
@@ -974,6 +1034,12 @@ class EtchingSimulationUI(QWidget):
         self.process_btn.setEnabled(True)
         self.process_btn.setText("开始模拟")
 
+    def _etch_stats_from_results(self, results):
+        """取模拟线程附带的刻蚀量统计，缺失时在主线程补算"""
+        if 'etch_amount_stats' in results:
+            return results['etch_amount_stats']
+        return self.processor.calculate_etch_amount_stats()
+
     def restart_simulation_with_optimized_data(self, new_file_path, new_data):
         """使用优化后的数据重新启动模拟"""
         try:
@@ -1011,15 +1077,15 @@ class EtchingSimulationUI(QWidget):
         """优化数据模拟完成处理"""
         try:
             # 更新图表
-            self.update_plots()
+            self.schedule_plot_update()
 
             # 更新统计信息（使用与原始模拟相同的方式）
             initial_stats = results.get('initial_thickness_stats', {})
             target_thickness = results.get('target_thickness', 0)
             validated_stats = results.get('validated_thickness_stats', {})  # 使用验算统计
 
-            # 计算刻蚀量统计
-            etch_stats = self.processor.calculate_etch_amount_stats()
+            # 刻蚀量统计已在模拟线程中算好
+            etch_stats = self._etch_stats_from_results(results)
 
             self.update_stat_labels(initial_stats, target_thickness, validated_stats, etch_stats)
 
@@ -1066,61 +1132,22 @@ class EtchingSimulationUI(QWidget):
         """更新模拟过程统计显示"""
         try:
             # 更新模拟次数
-            self.process_stat_labels['simulation_count'].setText(str(self.simulation_count))
+            self._set_label_text(self.process_stat_labels['simulation_count'], str(self.simulation_count))
 
             # 更新异常值剔除次数
-            self.process_stat_labels['outlier_removal_count'].setText(str(self.outlier_removal_count))
+            self._set_label_text(self.process_stat_labels['outlier_removal_count'], str(self.outlier_removal_count))
 
             # 更新已剔除异常点个数
-            self.process_stat_labels['total_removed_points'].setText(str(self.total_removed_points))
-
-            # 根据统计信息设置不同的颜色提示
-            # 模拟次数始终显示为正常
-            self.process_stat_labels['simulation_count'].setStyleSheet("""
-                font-weight: bold;
-                background-color: #e8f5e8;
-                border: 1px solid #c3e6c3;
-                border-radius: 3px;
-                padding: 2px 8px;
-            """)
+            self._set_label_text(self.process_stat_labels['total_removed_points'], str(self.total_removed_points))
 
+            # 根据统计信息设置不同的颜色提示（模拟次数始终显示为正常）
             # 异常值剔除次数：0为正常，>0为警告状态
-            if self.outlier_removal_count == 0:
-                outlier_style = """
-                    font-weight: bold;
-                    background-color: #e8f5e8;
-                    border: 1px solid #c3e6c3;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """
-            else:
-                outlier_style = """
-                    font-weight: bold;
-                    background-color: #fff3cd;
-                    border: 1px solid #ffeaa7;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """
-            self.process_stat_labels['outlier_removal_count'].setStyleSheet(outlier_style)
+            self._set_stat_variant(self.process_stat_labels['outlier_removal_count'],
+                                   '' if self.outlier_removal_count == 0 else 'warn')
 
             # 已剔除异常点个数：0为正常，>0为警告状态
-            if self.total_removed_points == 0:
-                removed_style = """
-                    font-weight: bold;
-                    background-color: #e8f5e8;
-                    border: 1px solid #c3e6c3;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """
-            else:
-                removed_style = """
-                    font-weight: bold;
-                    background-color: #f8d7da;
-                    border: 1px solid #f5c6cb;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """
-            self.process_stat_labels['total_removed_points'].setStyleSheet(removed_style)
+            self._set_stat_variant(self.process_stat_labels['total_removed_points'],
+                                   '' if self.total_removed_points == 0 else 'alert')
 
         except Exception as e:
             print(f"更新模拟过程统计失败: {str(e)}")
@@ -1162,13 +1189,13 @@ class EtchingSimulationUI(QWidget):
     def _check_and_handle_historical_files(self):
         """检查并处理历史异常值文件"""
         try:
-            import glob
+            import fnmatch
 
             if not self.etching_file or not os.path.exists(self.etching_file):
                 return True
 
             # 获取原始文件的基本名称（不含扩展名）
-            base_name = os.path.splitext(os.path.basename(self.etching_file))[0]
+            base_name = self._etching_file_names()[1]
             file_dir = os.path.dirname(self.etching_file)
 
             # 查找所有历史异常值文件
@@ -1178,10 +1205,12 @@ class EtchingSimulationUI(QWidget):
                 f"{base_name}_error_deleted_*_time_min_removed_*.csv"
             ]
 
+            # 只列一次目录，每个文件名依次匹配各模式（与 glob 相同的通配规则）
             historical_files = []
-            for pattern in patterns:
-                files = glob.glob(os.path.join(file_dir, pattern))
-                historical_files.extend(files)
+            with os.scandir(file_dir or os.curdir) as entries:
+                for entry in entries:
+                    if entry.is_file() and any(fnmatch.fnmatch(entry.name, pattern) for pattern in patterns):
+                        historical_files.append(entry.path)
 
             if not historical_files:
                 return True  # 没有历史文件，可以继续
@@ -1260,50 +1289,70 @@ class EtchingSimulationUI(QWidget):
             print(f"检查历史文件时出错: {str(e)}")
             return True  # 出错时默认允许继续
 
+    def schedule_plot_update(self):
+        """登记一次图表刷新，在返回事件循环后执行；连续多次请求合并为一次"""
+        if self._plot_update_pending:
+            return
+        self._plot_update_pending = True
+        QTimer.singleShot(0, self._run_pending_plot_update)
+
+    def _run_pending_plot_update(self):
+        """执行已登记的图表刷新"""
+        self._plot_update_pending = False
+        self.update_plots()
+
     def update_plots(self):
         """更新所有图表显示模拟结果"""
         print(f"[DEBUG] update_plots 开始执行")
         try:
+            processor = self.processor
+            # 各结果数据只取一次，供多个图表共用（验算后膜厚每次调用都会重新计算）
+            initial_map = getattr(processor, 'initial_thickness_map', None)
+            etching_depth_map = getattr(processor, 'etching_depth_map', None)
+            get_validated = getattr(processor, 'get_validated_thickness_map', None)
+            validated_map = get_validated() if get_validated is not None else None
+
             print(f"[DEBUG] 开始更新膜厚分布图")
             # 更新膜厚分布图
             self.update_single_thickness_plot(
                 self.ax_initial,
-                self.processor.initial_thickness_map,
+                initial_map,
                 "初始膜厚 (nm)",
                 'viridis',
                 True,
-                self.processor
+                processor
             )
             print(f"[DEBUG] 初始膜厚图更新完成")
             
             self.update_single_thickness_plot(
                 self.ax_etching_depth,
-                self.processor.etching_depth_map if hasattr(self.processor, 'etching_depth_map') else None,
+                etching_depth_map,
                 "目标刻蚀深度 (nm)",
                 'plasma',
                 True,
-                self.processor
+                processor
             )
             
             # 修改: 显示验算后膜厚
             self.update_single_thickness_plot(
                 self.ax_result,
-                self.processor.get_validated_thickness_map() if hasattr(self.processor, 'get_validated_thickness_map') else None,
+                validated_map,
                 "验算后膜厚 (nm)",
                 'coolwarm',
                 True,
-                self.processor
+                processor
             )
 
             # 新增: 显示刻蚀量膜厚
             etch_amount_data = None
-            if (hasattr(self.processor, 'initial_thickness_map') and
-                hasattr(self.processor, 'get_validated_thickness_map')):
-                initial_map = self.processor.initial_thickness_map
-                validated_map = self.processor.get_validated_thickness_map()
-                if initial_map is not None and validated_map is not None:
-                    # 计算刻蚀量 = 初始膜厚 - 验算后膜厚
-                    etch_amount_data = initial_map - validated_map
+            if initial_map is not None and validated_map is not None:
+                # 计算刻蚀量 = 初始膜厚 - 验算后膜厚，相减与晶圆外置NaN在同一遍中完成
+                from core.map_kernels import masked_difference
+                dtype = np.result_type(initial_map, validated_map)
+                etch_amount_data = self._display_buffer(self.ax_etch_amount, initial_map.shape)
+                masked_difference(initial_map.astype(dtype, copy=False),
+                                  validated_map.astype(dtype, copy=False),
+                                  self._plot_wafer_mask(processor), etch_amount_data)
 
             self.update_single_thickness_plot(
                 self.ax_etch_amount,
@@ -1311,170 +1360,238 @@ class EtchingSimulationUI(QWidget):
                 "刻蚀量膜厚 (nm)",
                 'coolwarm',  # 使用与验算后膜厚相同的颜色风格
                 True,
-                self.processor
+                processor,
+                premasked=True
             )
 
-            # 更新束流与运动图
-            if hasattr(self.processor, 'dwell_time'):
-                self.update_single_plot(
-                    self.ax_dwell,
-                    self.processor.dwell_time, 
-                    "停留时间分布 (s)",
-                    'cividis',
-                    True,
-                    self.processor
-                )
-                
-                # 更新离子束分布图
-                self.update_single_plot(
-                    self.ax_beam,
-                    self.processor.beam_profile, 
-                    "离子束分布",
-                    'inferno',
-                    True,
-                    self.processor
-                )
-                
-                # 更新速度分布图
-                self.update_single_plot(
-                    self.ax_velocity,
-                    self.processor.velocity_map if hasattr(self.processor, 'velocity_map') else None,
-                    "速度分布 (mm/s)",
-                    'jet',
-                    True,
-                    self.processor
-                )
+            # 更新束流与运动图（该选项卡尚未创建时，在首次显示时再绘制）
+            if self._beam_motion_built and hasattr(processor, 'dwell_time'):
+                self._update_beam_motion_plots()
             
-            # 重绘画布
-            print(f"[DEBUG] 开始重绘画布，共7个画布")
-            for i, canvas in enumerate([self.canvas_initial, self.canvas_etching_depth, self.canvas_result,
-                          self.canvas_etch_amount, self.canvas_beam, self.canvas_dwell, self.canvas_velocity]):
-                print(f"[DEBUG] 重绘画布 {i}/6")
-                try:
-                    canvas.draw()
-                    print(f"[DEBUG] 画布 {i} 绘制完成")
-                except Exception as canvas_e:
-                    print(f"[DEBUG] 画布 {i} 绘制失败: {str(canvas_e)}")
-                    continue
-            print(f"[DEBUG] 所有画布重绘完成")
+            # 重绘画布：登记延迟重绘，由Qt事件循环统一栅格化，不在此处逐个阻塞绘制
+            canvases = [self.canvas_initial, self.canvas_etching_depth, self.canvas_result, self.canvas_etch_amount]
+            if self._beam_motion_built:
+                canvases += [self.canvas_beam, self.canvas_dwell, self.canvas_velocity]
+            for canvas in canvases:
+                canvas.draw_idle()
                 
         except Exception as e:
             print(f"更新图表错误: {str(e)}")
     
-    def update_single_thickness_plot(self, ax, data, title, cmap, add_circle, processor):
-        """更新单个膜厚分布图表 - 仅显示晶圆内部区域"""
-        # 在清除坐标轴之前先移除colorbar
-        if hasattr(ax, '_colorbar') and ax._colorbar is not None:
-            ax._colorbar.remove()
+    def _update_beam_motion_plots(self):
+        """更新束流与运动选项卡的三个图表"""
+        processor = self.processor
+        self.update_single_plot(
+            self.ax_dwell,
+            processor.dwell_time, 
+            "停留时间分布 (s)",
+            'cividis',
+            True,
+            processor
+        )
+        
+        # 更新离子束分布图
+        self.update_single_plot(
+            self.ax_beam,
+            processor.beam_profile, 
+            "离子束分布",
+            'inferno',
+            True,
+            processor
+        )
+        
+        # 更新速度分布图
+        self.update_single_plot(
+            self.ax_velocity,
+            getattr(processor, 'velocity_map', None),
+            "速度分布 (mm/s)",
+            'jet',
+            True,
+            processor
+        )
+    
+    def _plot_wafer_mask(self, processor):
+        """返回绘图用的晶圆内部掩模，处理器网格和晶圆半径未变时复用上次结果"""
+        cache = self._wafer_mask_cache
+        if (cache is not None and cache[0] is processor.X and cache[1] is processor.Y
+                and cache[2] == processor.wafer_radius):
+            return cache[3]
+        # 比较距离平方，省去整幅网格的开方
+        r2 = processor.X * processor.X + processor.Y * processor.Y
+        wafer_mask = r2 <= processor.wafer_radius * processor.wafer_radius
+        self._wafer_mask_cache = (processor.X, processor.Y, processor.wafer_radius, wafer_mask)
+        return wafer_mask
+    
+    def _display_buffer(self, ax, shape):
+        """
+        返回该坐标轴复用的显示数组（_DISPLAY_DTYPE），形状变化时重新分配
+        
+        imshow/set_data 会复制传入的数组，因此同一缓冲区可在每次刷新时直接覆盖写入
+        """
+        buf = getattr(ax, '_display_buf', None)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=self._DISPLAY_DTYPE)
+            ax._display_buf = buf
+        return buf
+    
+    def _ensure_wafer_circle(self, ax, radius, linewidth):
+        """
+        确保坐标轴上有晶圆轮廓线
+        
+        轮廓只在首次绘制（或坐标轴清除后）创建一次并保存在 ax._wafer_circle，
+        之后仅在晶圆半径变化时调整半径，不重新创建
+        """
+        circle = getattr(ax, '_wafer_circle', None)
+        if circle is None:
+            circle = Circle((0, 0), radius, 
+                            fill=False, edgecolor='white', 
+                            linestyle='--', linewidth=linewidth)
+            ax.add_artist(circle)
+            ax._wafer_circle = circle
+        elif circle.get_radius() != radius:
+            circle.set_radius(radius)
+        return circle
+    
+    def update_single_thickness_plot(self, ax, data, title, cmap, add_circle, processor, premasked=False):
+        """
+        更新单个膜厚分布图表 - 仅显示晶圆内部区域
+        
+        premasked: data 已将晶圆外部置为NaN时为 True，跳过掩模填充
+        """
+        from core.map_kernels import fill_nan_outside_mask
+        grid_size = processor.grid_size
+        extent = [-grid_size/2, grid_size/2, -grid_size/2, grid_size/2]
+        cbar = getattr(ax, '_colorbar', None)
+        im = getattr(ax, '_im', None)
+
+        if data is not None:
+            if premasked:
+                masked_data = data
+            else:
+                # 晶圆掩模（仅显示晶圆内部区域）
+                wafer_mask = self._plot_wafer_mask(processor)
+                
+                # 应用掩模：只保留晶圆内部的数值，外部设为NaN（透明）
+                masked_data = self._display_buffer(ax, data.shape)
+                fill_nan_outside_mask(data, wafer_mask, masked_data)
+
+            if im is not None:
+                # 已有图像：只替换数据和颜色范围，坐标轴、标题、晶圆轮廓与颜色条原样保留
+                im.set_data(masked_data)
+                im.set_extent(extent)
+                im.autoscale()
+                if add_circle:
+                    self._ensure_wafer_circle(ax, processor.wafer_radius, 1.5)
+                return
+        elif cbar is not None:
+            # 数据不可用时移除colorbar
+            cbar.remove()
             ax._colorbar = None
         
         ax.clear()
-        grid_size = processor.grid_size
+        ax._wafer_circle = None  # 轮廓已随坐标轴一同清除
 
         # 创建图像
         if data is None:
-            im = ax.imshow(np.zeros((10, 10)), 
-                       extent=[-grid_size/2, grid_size/2, 
-                               -grid_size/2, grid_size/2],
-                       cmap='afmhot')
+            ax.imshow(np.zeros((10, 10)), extent=extent, cmap='afmhot')
             ax.text(0.5, 0.5, "数据不可用", 
                    ha='center', va='center', 
                    transform=ax.transAxes,
                    color='red', fontsize=12)
+            ax._im = None
         else:
-            # 创建晶圆掩模（仅显示晶圆内部区域）
-            r = np.sqrt(processor.X**2 + processor.Y**2)
-            wafer_mask = r <= processor.wafer_radius
-            
-            # 应用掩模：只保留晶圆内部的数值，外部设为NaN（透明）
-            masked_data = np.full_like(data, np.nan)
-            masked_data[wafer_mask] = data[wafer_mask]
-            
             # 创建图像（使用masked_array确保透明效果）
-            im = ax.imshow(masked_data, 
-                   extent=[-grid_size/2, grid_size/2, 
-                           -grid_size/2, grid_size/2],
-                   cmap=cmap, origin='lower')
+            im = ax.imshow(masked_data, extent=extent,
+                   cmap=cmap, origin='lower', interpolation='nearest')
+            ax._im = im  # 之后的更新通过 set_data 复用该图像
             
-            # 添加颜色条
-            # 添加颜色条并保存到axes对象
-            cbar = ax.figure.colorbar(im, ax=ax, shrink=0.8)
-            ax._colorbar = cbar  # 保存到axes对象中
+            # 添加颜色条：已存在时只切换映射对象，不重建颜色条坐标轴
+            if cbar is not None:
+                cbar.update_normal(im)
+            else:
+                cbar = ax.figure.colorbar(im, ax=ax, shrink=0.8)
+                ax._colorbar = cbar  # 保存到axes对象中
             cbar.set_label('nm')
         
-        # 添加晶圆轮廓
+        # 添加晶圆轮廓（加粗轮廓线）
         if add_circle:
-            circle = plt.Circle((0, 0), processor.wafer_radius, 
-                            fill=False, edgecolor='white', 
-                            linestyle='--', linewidth=1.5)  # 加粗轮廓线
-            ax.add_artist(circle)
+            self._ensure_wafer_circle(ax, processor.wafer_radius, 1.5)
         
         # 设置标题和标签
         ax.set_title(title, fontsize=10)
         ax.set_xlabel('X (mm)', fontsize=9)
         ax.set_ylabel('Y (mm)', fontsize=9)
-        
-        # 优化布局
-        plt.tight_layout(pad=1.0)
     
     def update_single_plot(self, ax, data, title, cmap, add_circle, processor):
         """更新单个图表（为停留时间分布图添加遮罩）"""
         if data is None:
             return
+        from core.map_kernels import fill_nan_outside_mask
         
-        # 在清除坐标轴之前先移除colorbar
-        if hasattr(ax, '_colorbar') and ax._colorbar is not None:
-            ax._colorbar.remove()
-            ax._colorbar = None
-        
-        ax.clear()
         grid_size = processor.grid_size
+        extent = [-grid_size/2, grid_size/2, -grid_size/2, grid_size/2]
+        cbar = getattr(ax, '_colorbar', None)
+        im = getattr(ax, '_im', None)
         vmin = None
         vmax = None
 
         # 检查是否为停留时间分布图或速度分布图（需要晶圆内部遮罩）
         if title in ["停留时间分布 (s)", "速度分布 (mm/s)"]:
-            # 创建晶圆掩模（仅显示晶圆内部区域）
-            r = np.sqrt(processor.X**2 + processor.Y**2)
-            wafer_mask = r <= processor.wafer_radius
+            # 晶圆掩模（仅显示晶圆内部区域）
+            wafer_mask = self._plot_wafer_mask(processor)
             
             # 应用掩模：只保留晶圆内部的数值，外部设为NaN（透明）
-            masked_data = np.full_like(data, np.nan)
-            masked_data[wafer_mask] = data[wafer_mask]
-            
-            # 自动计算颜色范围（基于晶圆内部数据）
-            if np.any(~np.isnan(masked_data)):
-                vmin = np.nanmin(masked_data)
-                vmax = np.nanmax(masked_data)
+            masked_data = self._display_buffer(ax, data.shape)
+            fill_nan_outside_mask(data, wafer_mask, masked_data)
             
-            # 创建图像（使用masked_array确保透明效果）
-            im = ax.imshow(masked_data, 
-                        extent=[-grid_size/2, grid_size/2, 
-                                -grid_size/2, grid_size/2],
-                        cmap=cmap, origin='lower',
-                        vmin=vmin, vmax=vmax)
+            # 自动计算颜色范围（基于晶圆内部数据，直接对掩模内的数值归约）
+            inside = data[wafer_mask]
+            if inside.size:
+                vmin = inside.min()
+                vmax = inside.max()
+                if np.isnan(vmin):
+                    # 内部含NaN时忽略NaN统计，全为NaN时不设颜色范围
+                    inside = inside[~np.isnan(inside)]
+                    vmin, vmax = (inside.min(), inside.max()) if inside.size else (None, None)
+            plot_data = masked_data
         else:
             # 其他图表正常绘制
-            im = ax.imshow(data, 
-                        extent=[-grid_size/2, grid_size/2, 
-                                -grid_size/2, grid_size/2],
-                        cmap=cmap, origin='lower')
-        
-        # 添加晶圆轮廓
-        circle = plt.Circle((0, 0), processor.wafer_radius, 
-                            fill=False, edgecolor='white', 
-                            linestyle='--', linewidth=1.2)
-        ax.add_artist(circle)
+            plot_data = data.astype(self._DISPLAY_DTYPE, copy=False)
+
+        if im is not None:
+            # 已有图像：只替换数据和颜色范围，不清除坐标轴、不重建晶圆轮廓和颜色条
+            im.set_data(plot_data)
+            im.set_extent(extent)
+            if vmin is not None:
+                im.set_clim(vmin, vmax)
+            else:
+                im.autoscale()
+            self._ensure_wafer_circle(ax, processor.wafer_radius, 1.2)
+        else:
+            ax.clear()
+            ax._wafer_circle = None  # 轮廓已随坐标轴一同清除
+
+            # 创建图像（使用masked_array确保透明效果）
+            im = ax.imshow(plot_data, extent=extent,
+                        cmap=cmap, origin='lower', interpolation='nearest',
+                        vmin=vmin, vmax=vmax)
+            ax._im = im  # 之后的更新通过 set_data 复用该图像
+            
+            # 添加晶圆轮廓
+            self._ensure_wafer_circle(ax, processor.wafer_radius, 1.2)
+            
+            ax.set_xlabel('X (mm)', fontsize=9)
+            ax.set_ylabel('Y (mm)', fontsize=9)
+
+            # 添加颜色条：已存在时只切换映射对象，不重建颜色条坐标轴
+            if cbar is not None:
+                cbar.update_normal(im)
+            else:
+                cbar = ax.figure.colorbar(im, ax=ax, shrink=0.8)
+                ax._colorbar = cbar  # 保存到axes对象中
         
-        # 设置标题和标签
+        # 设置标题
         ax.set_title(title, fontsize=10)
-        ax.set_xlabel('X (mm)', fontsize=9)
-        ax.set_ylabel('Y (mm)', fontsize=9)
-
-        # 添加颜色条
-        # 添加颜色条并保存到axes对象
-        cbar = ax.figure.colorbar(im, ax=ax, shrink=0.8)
-        ax._colorbar = cbar  # 保存到axes对象中
         
         # 对特定图表添加额外信息
         if title in ["停留时间分布 (s)", "速度分布 (mm/s)"] and vmin is not None and vmax is not None:
@@ -1484,9 +1601,6 @@ class EtchingSimulationUI(QWidget):
             
             # 添加统计信息到标题
             ax.set_title(f"{title} [内部: {vmin:.4f}-{vmax:.4f} {unit.replace('(', '').replace(')', '').strip()}]", fontsize=10)
-        
-        # 优化布局
-        plt.tight_layout(pad=1.0)
 
     def generate_stage_speed_map(self):
         """生成载台运动速度地图"""
@@ -1519,29 +1633,20 @@ class EtchingSimulationUI(QWidget):
 
             # 读取速度分布文件
             print(f"[DEBUG] 开始读取CSV文件")
+            import pandas as pd
             df = pd.read_csv(velocity_file)
             print(f"[DEBUG] CSV文件读取完成，尺寸: {df.shape}")
             
             # 获取Y坐标列名（通常是第一列）
             y_col = df.columns[0]
             
-            original_y_coords = df[y_col].values
-            
-            # 1. 创建新的DataFrame（保持速度值不变）
-            new_df = df.copy()
-            new_df[y_col] = original_y_coords
-            
-            # 获取网格尺寸（从X坐标范围推断）
-            x_cols = list(new_df.columns[1:])  # X坐标列名
-            x_coords = np.array([float(x) for x in x_cols])
-            
-            # 计算原始尺寸（假设为正方形）
-            grid_size = (max(x_coords) - min(x_coords)) + (x_coords[1]-x_coords[0])
+            # 1. 取出速度矩阵与X/Y坐标数组，后续截取和抽行都在数组上进行
+            velocity = df.iloc[:, 1:].to_numpy()
+            x_coords = np.fromiter(map(float, df.columns[1:]), dtype=np.float64)
             
             # 2. 坐标平移（到载台中心）
-            new_df[y_col] += y_center
-            new_x_cols = [str(float(x) + x_center) for x in x_cols]
-            new_df.rename(columns=dict(zip(x_cols, new_x_cols)), inplace=True)
+            y_values = df[y_col].to_numpy(dtype=np.float64) + y_center
+            x_vals = x_coords + x_center
             
             # 3. 确定截取范围（使用用户配置的Recipe截取范围）
             half_size = self.recipe_range / 2
@@ -1550,65 +1655,45 @@ class EtchingSimulationUI(QWidget):
             min_y = y_center - half_size
             max_y = y_center + half_size
             
-            # 4.1 首先按Y坐标截取
-            y_values = new_df[y_col].values
+            # 4. 按Y坐标和X坐标截取
             y_mask = (y_values >= min_y) & (y_values <= max_y)
-            cropped_df = new_df[y_mask]
-            
-            # 4.2 然后按X坐标截取
-            x_cols_to_keep = [col for col in cropped_df.columns[1:] 
-                            if min_x <= float(col) <= max_x]
-            
-            # 创建最终DataFrame (包含Y列和选择的X列)
-            final_df = cropped_df.loc[:, [y_col] + x_cols_to_keep].copy()
+            x_keep = (x_vals >= min_x) & (x_vals <= max_x)
+            velocity = velocity[y_mask][:, x_keep]
+            x_vals = x_vals[x_keep]
 
             #################################################
             # 关键修改：仅反转Y列的值，同时保留行顺序
             #################################################
-            
-            # 获取Y值列
-            y_values = final_df[y_col].values
-            
-            # 反转Y值数组但保持行顺序
-            reversed_y = np.flip(y_values)
-            
-            # 只替换Y列，保持其他列不变
-            final_df.loc[:, y_col] = reversed_y
-            
+            y_values = np.flip(y_values[y_mask])
             #################################################
 
             #################################################
             # 修正的y-Step步长处理逻辑
             #################################################
             # 获取总行数（包括标题行）
-            total_rows = len(final_df)
+            total_rows = len(y_values)
             
             if y_step > 1:
                 # 记录原始信息
                 original_count = total_rows
                 
-                # 计算应该保留的行（标题行和每隔y_step选取的数据行）
-                rows_to_keep = []
-                #rows_to_keep.append(0)  # 总是保留标题行
-                
-                # 从第二行（索引0）开始，每隔(y_step)行选取一行
-                current_index = 0
-                while current_index < total_rows:
-                    rows_to_keep.append(current_index)
-                    current_index += y_step
-                    
-                # 选择保留的这些行
-                final_df = final_df.iloc[rows_to_keep]
-                
-                # 重置索引，使其连续
-                final_df.reset_index(drop=True, inplace=True)
+                # 从第一行（索引0）开始，每隔(y_step)行选取一行
+                velocity = velocity[::y_step]
+                y_values = y_values[::y_step]
                 
                 # 记录变化情况
-                new_count = len(final_df)
+                new_count = len(y_values)
                 reduction = original_count - new_count
                 reduction_pct = (reduction / original_count) * 100 if original_count > 0 else 0
             #################################################
             
+            # 创建最终DataFrame (包含Y列和选择的X列，列名为平移后的X坐标)；
+            # 未抽行时保留截取前的行索引，generate_smi_recipe 按索引标签跳过行
+            row_index = np.flatnonzero(y_mask) if y_step <= 1 else None
+            final_df = pd.DataFrame(velocity, index=row_index,
+                                    columns=[str(x) for x in x_vals.tolist()])
+            final_df.insert(0, y_col, y_values)
+            
             # 保存文件
             output_path = os.path.join(self.output_dir, "stage_Y-motor_speed_map.csv")
             final_df.to_csv(output_path, index=False)
@@ -1652,7 +1737,7 @@ class EtchingSimulationUI(QWidget):
             print(f"[DEBUG] SMI Recipe文件: {smi_recipe_path}")
 
             print(f"[DEBUG] 开始调用generate_smi_recipe")
-            self.generate_smi_recipe(final_df, smi_recipe_path)
+            self.generate_smi_recipe(final_df, smi_recipe_path, x_vals)
             print(f"[DEBUG] generate_smi_recipe调用完成")
 
             info_msg += f"\n\nSMI指令文件已生成!\n文件名: {smi_filename}\n"
@@ -1683,12 +1768,13 @@ class EtchingSimulationUI(QWidget):
             self.main_window.update_status_message(f"生成载台运动速度失败: {str(e)}", "error")
 
     # 新增的函数
-    def generate_smi_recipe(self, speed_map_df, output_path):
+    def generate_smi_recipe(self, speed_map_df, output_path, x_coords=None):
         """根据速度地图生成SMI Recipe文件
 
         Args:
             speed_map_df: 载台速度地图DataFrame
             output_path: 输出文件路径
+            x_coords: X列对应的坐标数组，未提供时从列名解析
         """
         print(f"[DEBUG] generate_smi_recipe 开始执行")
         print(f"[DEBUG] 输入DataFrame尺寸: {speed_map_df.shape}")
@@ -1699,109 +1785,72 @@ class EtchingSimulationUI(QWidget):
         x_columns = list(speed_map_df.columns[1:])  # X坐标列名列表
         print(f"[DEBUG] Y列名: {y_col}, X列数: {len(x_columns)}")
         
-        # 创建列名到X坐标的映射（字符串到浮点数）
-        x_positions = {}
-        for col_name in x_columns:
-            try:
-                x_positions[col_name] = float(col_name)
-            except ValueError:
-                # 如果无法转换为浮点数，保留原始值
-                x_positions[col_name] = col_name
-        
-        # 准备SMI Recipe数据
-        recipe_data = []
-        self.recipe_rows = 0  # 记录生成的行数
-        
-        # 跟踪上一个点的X位置
-        prev_x = None
-        
-        # 蛇形遍历所有列
-        total_columns = len(x_columns)
+        if x_coords is None:
+            # 创建列名到X坐标的映射（字符串到浮点数）
+            x_positions = {}
+            for col_name in x_columns:
+                try:
+                    x_positions[col_name] = float(col_name)
+                except ValueError:
+                    # 如果无法转换为浮点数，保留原始值
+                    x_positions[col_name] = col_name
+
+            x_coords = np.array([x_positions[col_name] for col_name in x_columns])
+
+        # 取出Y坐标与速度矩阵，整列运算代替逐行遍历
+        y_values = speed_map_df[y_col].to_numpy(dtype=np.float64)
+        speeds = speed_map_df[x_columns].to_numpy(dtype=np.float64, copy=True)
+        total_rows, total_columns = speeds.shape
         print(f"[DEBUG] 开始蛇形遍历 {total_columns} 列")
 
-        for col_idx, col_name in enumerate(x_columns):
-            if col_idx % 10 == 0:  # 每处理10列输出一次进度
-                print(f"[DEBUG] 处理第 {col_idx+1}/{total_columns} 列: {col_name}")
-
-            # 确定列遍历方向（奇数列向上，偶数列向下）
-            col_data = speed_map_df[[y_col, col_name]]
-
-            if col_idx % 2 == 1:  # 奇数列，从下往上遍历
-                col_data = col_data.iloc[::-1].reset_index(drop=True)
-
-            # 遍历该列的所有行
-            for row_idx, row in col_data.iterrows():
-                # 第一行是坐标标题行，跳过
-                if row_idx == 0:
-                    continue
-                    
-                point_number = self.recipe_rows + 1
-                y_pos = float(row[y_col])  # Y位置
-                x_pos = x_positions[col_name]  # X位置
-                y_speed = float(row[col_name])  # Y速度
-                
-                # 确定X速度 (与前一行的X位置比较)
-                if self.recipe_rows == 0:
-                    # 第一点默认100
-                    x_speed = 100.0
-                else:
-                    # 比较当前X位置和前一个点的X位置
-                    x_speed = 100.0 if x_pos != prev_x else 0.0
-                
-                # 添加到recipe数据
-                recipe_data.append({
-                    "Point": point_number,
-                    "X-Position": x_pos,
-                    "X-Speed": x_speed,
-                    "Y-Position": y_pos,
-                    "Y-Speed": y_speed
-                })
-                
-                self.recipe_rows += 1
-                prev_x = x_pos
-        
-        # 规则8: 对于X-Speed为100的行(除了第一行)，设置Y-Speed为0
-        for i in range(1, len(recipe_data)):  # 从第二行开始(索引1)
-            if recipe_data[i]["X-Speed"] == 100.0:
-                recipe_data[i]["Y-Speed"] = 0.0
-        
-        # 规则9: 添加最后一行全0的数据
-        # 下一行的Point编号
-        last_point = recipe_data[-1]["Point"] + 1 if recipe_data else 1
-        recipe_data.append({
-            "Point": last_point,
-            "X-Position": 0.0,
-            "X-Speed": 0.0,
-            "Y-Position": 0.0,
-            "Y-Speed": 0.0
-        })
-        self.recipe_rows += 1  # 增加行数计数
+        # 确定列遍历方向（奇数列向上，偶数列向下）
+        speeds[:, 1::2] = speeds[::-1, 1::2]
+        y_grid = np.where(np.arange(total_columns)[None, :] % 2 == 0,
+                          y_values[:, None], y_values[::-1, None])
+
+        # 跳过的行与逐行遍历一致：偶数列保持原行索引，只跳过索引标签为0的行；
+        # 奇数列反转后重置了索引，跳过遍历的第一行
+        keep = np.ones((total_rows, total_columns), dtype=np.bool_)
+        if total_rows:
+            keep[0, 1::2] = False
+            keep[np.asarray(speed_map_df.index == 0), 0::2] = False
+
+        # 按列优先展开得到蛇形顺序
+        y_speed = speeds.T[keep.T]
+        y_pos = y_grid.T[keep.T]
+        x_pos = np.repeat(x_coords, keep.sum(axis=0))
+
+        # 确定X速度：第一点默认100，X位置变化（换列）时为100，否则为0
+        x_speed = np.zeros(len(x_pos), dtype=np.float64)
+        if len(x_pos):
+            x_speed[0] = 100.0
+            x_speed[1:][x_pos[1:] != x_pos[:-1]] = 100.0
+        self.recipe_rows = len(x_pos)  # 记录生成的行数
 
         print(f"[DEBUG] 蛇形遍历完成，共生成 {self.recipe_rows} 行数据")
 
         # 规则8: 对于X-Speed为100的行(除了第一行)，设置Y-Speed为0
         print(f"[DEBUG] 开始应用规则8")
-        for i in range(1, len(recipe_data)):  # 从第二行开始(索引1)
-            if recipe_data[i]["X-Speed"] == 100.0:
-                recipe_data[i]["Y-Speed"] = 0.0
+        y_speed[1:][x_speed[1:] == 100.0] = 0.0
 
         # 规则9: 添加最后一行全0的数据
-        # 下一行的Point编号
-        last_point = recipe_data[-1]["Point"] + 1 if recipe_data else 1
-        recipe_data.append({
-            "Point": last_point,
-            "X-Position": 0.0,
-            "X-Speed": 0.0,
-            "Y-Position": 0.0,
-            "Y-Speed": 0.0
-        })
+        x_pos, x_speed, y_pos, y_speed = (
+            np.append(arr, 0.0) for arr in (x_pos, x_speed, y_pos, y_speed)
+        )
         self.recipe_rows += 1  # 增加行数计数
         print(f"[DEBUG] 添加最后一行，总行数: {self.recipe_rows}")
 
         # 创建DataFrame并保存
         print(f"[DEBUG] 开始创建DataFrame并保存CSV")
-        if recipe_data:
-            recipe_df = pd.DataFrame(recipe_data)
+        if self.recipe_rows:
+            import pandas as pd
+            recipe_df = pd.DataFrame({
+                "Point": np.arange(1, self.recipe_rows + 1),
+                "X-Position": x_pos,
+                "X-Speed": x_speed,
+                "Y-Position": y_pos,
+                "Y-Speed": y_speed
+            })
             print(f"[DEBUG] DataFrame创建完成，开始保存到: {output_path}")
             recipe_df.to_csv(output_path, index=False)
             print(f"[DEBUG] CSV文件保存完成")
@@ -1822,8 +1871,7 @@ class EtchingSimulationUI(QWidget):
         # 获取刻蚀文件名（不带扩展名）
         etching_name = ""
         if self.etching_file:
-            etching_filename = os.path.basename(self.etching_file)
-            etching_name, _ = os.path.splitext(etching_filename)
+            etching_name = self._etching_file_names()[1]
             etching_name = etching_name.replace(" ", "_").replace("(", "").replace(")", "")
         
         # 获取离子束文件名（不带扩展名）
@@ -1853,13 +1901,14 @@ class EtchingSimulationUI(QWidget):
             self.uniformity_threshold = dialog.get_uniformity_threshold()
             self.speed_threshold = dialog.get_speed_threshold()
 
-            # 保存到配置文件
+            # 保存到配置文件（四项一起更新，只写一次文件）
             try:
-                config_manager = get_config_manager()
-                config_manager.set_transition_width(self.transition_width)
-                config_manager.set_recipe_range(self.recipe_range)
-                config_manager.set_uniformity_threshold(self.uniformity_threshold)
-                config_manager.set_speed_threshold(self.speed_threshold)
+                self.config_manager.update_config({
+                    "transition_width": float(self.transition_width),
+                    "recipe_range": int(self.recipe_range),
+                    "uniformity_threshold": float(self.uniformity_threshold),
+                    "speed_threshold": float(self.speed_threshold),
+                })
 
                 self.main_window.update_status_message(
                     f"高级选项已更新并保存: 过渡区宽度={self.transition_width}mm, Recipe截取范围={self.recipe_range}mm, 均一性阈值={self.uniformity_threshold}%, 刻蚀量阈值={self.speed_threshold}nm"
@@ -1876,7 +1925,10 @@ class EtchingSimulationUI(QWidget):
         print(f"[DEBUG] _update_recipe_statistics 开始执行")
         print(f"[DEBUG] Recipe文件路径: {recipe_file_path}")
         try:
-            if hasattr(self, 'recipe_analyzer') and os.path.exists(recipe_file_path):
+            if os.path.exists(recipe_file_path):
+                if self.recipe_analyzer is None:
+                    from core.recipe_analyzer import RecipeAnalyzer
+                    self.recipe_analyzer = RecipeAnalyzer()
                 print(f"[DEBUG] 开始分析Recipe文件")
                 recipe_rows, etch_time_formatted, etch_time_seconds = self.recipe_analyzer.analyze_recipe_file(recipe_file_path)
                 print(f"[DEBUG] Recipe分析完成: 行数={recipe_rows}, 时间={etch_time_formatted}")
@@ -1887,13 +1939,8 @@ class EtchingSimulationUI(QWidget):
                 print(f"[DEBUG] UI显示更新完成")
 
                 # 为刻蚀时间应用不同的背景色（类似总剔除点数的红色系）
-                self.etch_time_value.setStyleSheet("""
-                    font-weight: bold;
-                    background-color: #f8d7da;
-                    border: 1px solid #f5c6cb;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """)
+                self._set_stat_variant(self.recipe_rows_value, '')
+                self._set_stat_variant(self.etch_time_value, 'alert')
 
                 # 记录到状态栏
                 self.main_window.update_status_message(
@@ -1904,45 +1951,30 @@ class EtchingSimulationUI(QWidget):
                 self.recipe_rows_value.setText("--")
                 self.etch_time_value.setText("--")
                 # 恢复默认样式
-                self.recipe_rows_value.setStyleSheet("""
-                    font-weight: bold;
-                    background-color: #e8f5e8;
-                    border: 1px solid #c3e6c3;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """)
-                self.etch_time_value.setStyleSheet("""
-                    font-weight: bold;
-                    background-color: #fff3cd;
-                    border: 1px solid #ffeaa7;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                """)
+                self._set_stat_variant(self.recipe_rows_value, '')
+                self._set_stat_variant(self.etch_time_value, 'warn')
 
         except Exception as e:
             print(f"更新Recipe统计失败: {str(e)}")
             # 显示错误状态 - 使用红色背景表示错误
-            error_style = """
-                font-weight: bold;
-                background-color: #f8d7da;
-                border: 1px solid #f5c6cb;
-                border-radius: 3px;
-                padding: 2px 8px;
-                color: #721c24;
-            """
             self.recipe_rows_value.setText("错误")
-            self.recipe_rows_value.setStyleSheet(error_style)
+            self._set_stat_variant(self.recipe_rows_value, 'error')
             self.etch_time_value.setText("错误")
-            self.etch_time_value.setStyleSheet(error_style)
+            self._set_stat_variant(self.etch_time_value, 'error')
+
+    def _flush_stage_center_config(self):
+        """立即保存尚在延迟中的载台中心坐标（读取配置前调用）"""
+        if self._stage_center_save_timer.isActive():
+            self._stage_center_save_timer.stop()
+            self._save_stage_center_config()
 
     def _save_stage_center_config(self):
         """保存载台中心坐标到配置文件"""
         try:
-            config_manager = get_config_manager()
             x_value = self.stage_center_x.value()
             y_value = self.stage_center_y.value()
 
-            if config_manager.set_stage_center(x_value, y_value):
+            if self.config_manager.set_stage_center(x_value, y_value):
                 print(f"载台中心坐标已保存: X={x_value}, Y={y_value}")
             else:
                 print("载台中心坐标保存失败")
@@ -2025,6 +2057,8 @@ class EtchingSimulationUI(QWidget):
             multiplier: 速度倍数(2或3)
         """
         try:
+            import pandas as pd
+
             # 读取原始Recipe文件
             df = pd.read_csv(original_path)
 
@@ -2062,6 +2096,9 @@ class EtchingSimulationUI(QWidget):
             simulation_data = self._prepare_simulation_data()
 
             # 生成模拟日志（使用从UI读取的刻蚀时间）
+            if self.simulation_logger is None:
+                from core.simulation_logger import SimulationLogger
+                self.simulation_logger = SimulationLogger()
             log_file_path = self.simulation_logger.generate_simulation_log(
                 self.output_dir,
                 simulation_data,
@@ -2082,11 +2119,12 @@ class EtchingSimulationUI(QWidget):
             Dict: 模拟数据字典
         """
         # 从配置管理器获取载台中心坐标
-        config_manager = get_config_manager()
+        self._flush_stage_center_config()
+        config_manager = self.config_manager
 
         # 准备基本模拟参数
         simulation_data = {
-            'file_name': os.path.basename(self.etching_file) if self.etching_file else '',
+            'file_name': self._etching_file_names()[0],
             'grid_size': 240,  # 默认网格尺寸，可以根据需要调整
             'resolution': 1.0,  # 默认分辨率
             'wf_size': 150,  # 默认晶圆尺寸
@@ -2482,6 +2520,8 @@ class EtchingSimulationUI(QWidget):
             wafer_diameter = float(self.wafer_diameter_combo.currentText())
             target_thickness = self.target_thickness_input.value()
 
+            from core.etching_processor import IonBeamProcessor
+            self._ensure_outlier_processor()
             self.processor = IonBeamProcessor(
                 grid_size=grid_size,
                 resolution=resolution,
@@ -2524,7 +2564,7 @@ class EtchingSimulationUI(QWidget):
                 initial_stats = results.get('initial_thickness_stats', {})
                 target_thickness = results.get('target_thickness', 0)
                 validated_stats = results.get('validated_thickness_stats', {})
-                etch_stats = self.processor.calculate_etch_amount_stats()
+                etch_stats = self._etch_stats_from_results(results)
 
                 print(f"[DEBUG] 开始更新统计标签")
                 self.update_stat_labels(initial_stats, target_thickness, validated_stats, etch_stats)
@@ -2627,7 +2667,7 @@ class EtchingSimulationUI(QWidget):
             initial_stats = results.get('initial_thickness_stats', {})
             target_thickness = results.get('target_thickness', 0)
             validated_stats = results.get('validated_thickness_stats', {})
-            etch_stats = self.processor.calculate_etch_amount_stats()
+            etch_stats = self._etch_stats_from_results(results)
 
             print(f"[DEBUG] 开始更新统计信息")
             self.update_stat_labels(initial_stats, target_thickness, validated_stats, etch_stats)
@@ -3197,13 +3237,13 @@ class EtchingSimulationUI(QWidget):
         try:
             # 清除膜厚统计
             for key in self.stat_labels:
-                self.stat_labels[key].setText("--")
-                self.stat_labels[key].setStyleSheet("")
+                self._set_label_text(self.stat_labels[key], "--")
+                self._set_stat_variant(self.stat_labels[key], '')
 
             # 清除模拟过程统计
-            self.process_stat_labels['simulation_count'].setText("0")
-            self.process_stat_labels['outlier_removal_count'].setText("0")
-            self.process_stat_labels['total_removed_points'].setText("0")
+            self._set_label_text(self.process_stat_labels['simulation_count'], "0")
+            self._set_label_text(self.process_stat_labels['outlier_removal_count'], "0")
+            self._set_label_text(self.process_stat_labels['total_removed_points'], "0")
 
             # 清除Recipe统计
             self.recipe_rows_value.setText("--")
@@ -3236,6 +3276,9 @@ class SimulationThread(QThread):
                 self.beam_file,
                 self.output_dir
             )
+            # 刻蚀量统计也在后台线程计算，避免完成回调阻塞界面
+            if results:
+                results['etch_amount_stats'] = self.processor.calculate_etch_amount_stats()
             print(f"[DEBUG] SimulationThread即将返回results")
             self.results_ready.emit(results)
         except Exception as e:
@@ -3274,6 +3317,9 @@ class CustomSimulationThread(QThread):
             else:
                 print(f"[DEBUG] results中已有original_etching_file: {results['original_etching_file']}")
 
+            # 刻蚀量统计也在后台线程计算，避免完成回调阻塞界面
+            results['etch_amount_stats'] = self.processor.calculate_etch_amount_stats()
+
             self.results_ready.emit(results)
 
         except Exception as e:
@@ -121,6 +121,10 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "不可用", "请先进入批量处理页面")
     
+    def clear_batch_data_cache(self):
+        """清除批量处理数据的解析缓存（菜单栏调用）"""
+        self.batch_wafer_tab.clear_data_cache()
+    
     def load_data(self):
         self.single_wafer_tab.load_data()
     
@@ -59,6 +59,10 @@ def create_menu_bar(parent):
     outlier_removal_action = data_menu.addAction("异常值再次剔除")
     outlier_removal_action.triggered.connect(parent.trigger_batch_outlier_removal)
 
+    # 新增菜单项：清除批量数据解析缓存
+    clear_cache_action = data_menu.addAction("清除批量数据缓存")
+    clear_cache_action.triggered.connect(parent.clear_batch_data_cache)
+
     range_select_action = data_menu.addAction("按厚度范围多选")
     range_select_action.setShortcut(QKeySequence("Ctrl+R"))
     range_select_action.triggered.connect(parent.select_by_thickness_range)